@@ -4,10 +4,6 @@ Authentication script for Zerodha Kite Connect
 Run this for first-time or daily authentication
 """
 import sys
-import os
-
-# Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from Core_Modules.auth import KiteAuth
 
@@ -5,11 +5,6 @@ Provides feature parity with gui_modern.py in a terminal interface
 """
 import sys
 import os
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import signal
 import threading
 import time
@@ -23,7 +18,8 @@ from Core_Modules.logger import setup_logging, get_logger
 from Core_Modules.utils import (
     get_portfolio_summary,
     export_positions_to_csv,
-    export_holdings_to_csv
+    export_holdings_to_csv,
+    PENDING_STATUSES
 )
 from Core_Modules.notifications import create_notification_manager_from_config
 from Core_Modules.strategies import TradingStrategies
@@ -109,7 +105,7 @@ class EnhancedTradingCLI:
         try:
             print(f"{Fore.YELLOW}Authenticating...")
             self.trader = KiteTrader()
-            self.strategies = TradingStrategies()
+            self.strategies = TradingStrategies(self.trader)
             self.is_authenticated = True
             self.print_success("Authenticated successfully!")
             return True
@@ -552,7 +548,7 @@ class EnhancedTradingCLI:
         try:
             # Show pending orders first
             orders = self.trader.get_orders()
-            pending = [o for o in orders if o['status'] in ['OPEN', 'TRIGGER PENDING']]
+            pending = [o for o in orders if o['status'] in PENDING_STATUSES]
             
             if not pending:
                 self.print_info("No pending orders to cancel")
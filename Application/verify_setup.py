@@ -5,9 +5,6 @@ Run this to check if your environment is configured correctly
 import sys
 import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 def check_environment():
     """Check if all required packages are installed"""
     print("\n" + "="*60)
@@ -0,0 +1,252 @@
+"""
+Numeric kernels for candle and price-series processing
+
+These operate on contiguous float64 NumPy arrays so strategies can compute
+indicators without touching per-candle dicts. Kernels are compiled with
+numba on first call when it is installed and run as plain Python otherwise;
+numba itself is only imported at that point, so importing strategies stays
+fast, and cache=True keeps the compiled code on disk between sessions.
+"""
+import functools
+
+import numpy as np
+
+# Rebound to numba.prange when the first kernel is compiled
+prange = range
+
+_njit_cache = {}
+
+
+def _compile(fn, signature, options):
+    """Compile fn with numba, or return it unchanged if numba is unavailable"""
+    global prange
+    try:
+        import numba
+    except ImportError:  # numba is optional - kernels still work, just slower
+        return fn
+    prange = numba.prange
+    if signature is None:
+        return numba.njit(**options)(fn)
+    return numba.njit(signature, **options)(fn)
+
+
+def njit_cached(signature=None, **options):
+    """
+    Decorator that defers numba import and JIT compilation to the first call
+
+    Args:
+        signature: Optional numba signature
+        **options: numba.njit options; cache defaults to True
+
+    The undecorated function stays available as .py_func, like a numba
+    dispatcher.
+    """
+    options.setdefault('cache', True)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            compiled = _njit_cache.get(fn)
+            if compiled is None:
+                compiled = _njit_cache[fn] = _compile(fn, signature, options)
+            return compiled(*args)
+
+        wrapper.py_func = fn
+        return wrapper
+
+    return decorator
+
+
+# Column order of the OHLCV matrix returned by candles_to_arrays
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+
+def candles_to_arrays(candles):
+    """
+    Convert Kite historical candles into NumPy arrays in a single pass
+
+    Args:
+        candles: List of candle dicts (date, open, high, low, close, volume)
+
+    Returns:
+        tuple: (timestamps, ohlcv) where timestamps is a datetime64[s] array
+            (UTC) and ohlcv is an (N, 5) float64 matrix in OPEN/HIGH/LOW/
+            CLOSE/VOLUME column order
+    """
+    n = len(candles)
+    ohlcv = np.empty((n, 5), dtype=np.float64)
+    epoch = np.empty(n, dtype=np.int64)
+
+    for i, candle in enumerate(candles):
+        ohlcv[i] = (candle['open'], candle['high'], candle['low'],
+                    candle['close'], candle['volume'])
+        epoch[i] = int(candle['date'].timestamp())
+
+    return epoch.view('datetime64[s]'), ohlcv
+
+
+@njit_cached()
+def _returns_njit(close):
+    """
+    Simple percentage returns of a close series
+
+    Args:
+        close: float64 array of closing prices
+
+    Returns:
+        float64 array, same length as close, first value is NaN
+    """
+    n = close.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    out[0] = np.nan
+    for i in range(1, n):
+        prev = close[i - 1]
+        out[i] = (close[i] - prev) / prev * 100.0 if prev != 0.0 else np.nan
+    return out
+
+
+@njit_cached()
+def _sma_njit(close, window):
+    """
+    Simple moving average using a running sum
+
+    Args:
+        close: float64 array of closing prices
+        window: Averaging window (number of candles)
+
+    Returns:
+        float64 array, same length as close, first window-1 values are NaN
+    """
+    n = close.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    for i in range(n):
+        total += close[i]
+        if i >= window:
+            total -= close[i - window]
+        out[i] = total / window if i >= window - 1 else np.nan
+    return out
+
+
+@njit_cached(fastmath=True)
+def _trail_sl_njit(current_price, entry_price, initial_sl_pct, trail_pct):
+    """
+    Trailing stop loss price for a long position
+
+    Args:
+        current_price: Last traded price
+        entry_price: Average entry price
+        initial_sl_pct: Initial stop loss percentage below entry
+        trail_pct: Trailing percentage below current price
+
+    Returns:
+        float: Stop loss price (unrounded)
+    """
+    profit_pct = (current_price - entry_price) / entry_price * 100.0
+    if profit_pct > initial_sl_pct:
+        return current_price * (1.0 - trail_pct / 100.0)
+    return entry_price * (1.0 - initial_sl_pct / 100.0)
+
+
+@njit_cached(fastmath=True)
+def _pct_change_njit(last, open_):
+    """
+    Percentage change from open to last for a batch of instruments
+
+    Args:
+        last: float64 array of last traded prices
+        open_: float64 array of opening prices
+
+    Returns:
+        float64 array of % changes, 0.0 where open is not positive
+    """
+    n = last.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        o = open_[i]
+        out[i] = (last[i] - o) / o * 100.0 if o > 0.0 else 0.0
+    return out
+
+
+@njit_cached(parallel=True, fastmath=True)
+def momentum_scan(opens, lasts, threshold):
+    """
+    % change from open and threshold test for a universe, in one fused pass
+
+    Args:
+        opens: float64 array of opening prices
+        lasts: float64 array of last traded prices
+        threshold: Minimum absolute % change for a hit
+
+    Returns:
+        tuple: (change, hit) - float64 % changes (0.0 where open is not
+            positive) and a bool mask of instruments meeting the threshold
+    """
+    n = opens.shape[0]
+    change = np.empty(n, dtype=np.float64)
+    hit = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        o = opens[i]
+        if o > 0.0:
+            c = (lasts[i] - o) / o * 100.0
+            change[i] = c
+            hit[i] = abs(c) >= threshold
+        else:
+            change[i] = 0.0
+            hit[i] = False
+    return change, hit
+
+
+# Columns of the per-instrument state matrix updated by update_tick_stats
+STAT_LAST, STAT_TICKS, STAT_MEAN, STAT_VAR = range(4)
+
+
+@njit_cached(fastmath=True)
+def update_tick_stats(slots, prices, state, alpha, history):
+    """
+    Fold a batch of ticks into per-instrument rolling statistics in place
+    
+    Keeps the tick count and an exponentially weighted mean and variance of
+    tick-to-tick log returns (sqrt of STAT_VAR is the rolling volatility).
+    
+    Args:
+        slots: int64 array, row of state for each tick (negative to skip)
+        prices: float64 array of last traded prices, one per tick
+        state: (n_instruments, 4) float64 matrix in STAT_* column order,
+            zero-initialised
+        alpha: EWMA smoothing factor in (0, 1]
+        history: (n_ticks, 4) float64 matrix; row i receives the state of
+            tick i's instrument right after that tick (untouched if skipped)
+    """
+    for i in range(slots.shape[0]):
+        s = slots[i]
+        if s < 0:
+            continue
+        price = prices[i]
+        prev = state[s, STAT_LAST]
+        if prev > 0.0 and price > 0.0:
+            diff = np.log(price / prev) - state[s, STAT_MEAN]
+            state[s, STAT_MEAN] += alpha * diff
+            state[s, STAT_VAR] = (1.0 - alpha) * (state[s, STAT_VAR] + alpha * diff * diff)
+        state[s, STAT_LAST] = price
+        state[s, STAT_TICKS] += 1.0
+        history[i, :] = state[s, :]
+
+
+returns = _returns_njit
+trail_sl = _trail_sl_njit
+pct_change = _pct_change_njit
+
+
+def sma(close, window):
+    """
+    Simple moving average of closing prices (see _sma_njit)
+
+    Raises:
+        ValueError: If window is less than 1
+    """
+    if window < 1:
+        raise ValueError(f"SMA window must be at least 1, got {window}")
+    return _sma_njit(close, window)
@@ -0,0 +1,304 @@
+"""
+Async trading module for concurrent Kite Connect REST calls
+
+KiteTrader wraps the blocking pykiteconnect client, so fetching quotes for
+several instrument groups or placing a basket of orders pays one network
+round-trip after another. AsyncKiteTrader talks to the same REST endpoints
+over a shared aiohttp session and issues independent requests concurrently.
+"""
+import asyncio
+import time
+
+import aiohttp
+from kiteconnect import exceptions as ex
+
+from .auth import KiteAuth
+from .config import Config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _AsyncTokenBucket:
+    """Token bucket for request rate limiting within one event loop"""
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate: Tokens added per second, also the maximum burst
+        """
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        while True:
+            # No await between the refill and the take, so no lock is needed
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncKiteTrader:
+    """asyncio counterpart of KiteTrader for multi-symbol fan-out"""
+
+    ROOT_URL = 'https://api.kite.trade'
+    KITE_VERSION = '3'
+
+    # Kite limits on instruments per request
+    QUOTE_BATCH_SIZE = 500
+    LTP_BATCH_SIZE = 1000
+
+    # Kite rejects order requests above 10 per second
+    ORDER_RATE_LIMIT = 10
+    MAX_ORDERS_IN_FLIGHT = 10
+
+    def __init__(self):
+        """Initialize with the access token of the authenticated session"""
+        auth = KiteAuth()
+
+        if not auth.access_token:
+            raise ValueError("Access token not available. Please authenticate first.")
+
+        self._headers = {
+            'X-Kite-Version': self.KITE_VERSION,
+            'Authorization': f'token {Config.API_KEY}:{auth.access_token}'
+        }
+        self._session = None
+        # Created on first use, inside the running event loop
+        self._order_limiter = None
+        self._order_slots = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self):
+        """Create the shared aiohttp session on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                base_url=self.ROOT_URL,
+                headers=self._headers
+            )
+        return self._session
+
+    async def _request(self, method, path, params=None, data=None):
+        """
+        Issue a REST request and unwrap Kite's response envelope
+
+        Args:
+            method (str): HTTP method
+            path (str): Endpoint path (e.g., '/quote')
+            params (list/dict, optional): Query parameters
+            data (dict, optional): Form body
+
+        Returns:
+            The 'data' field of the response
+        """
+        session = self._get_session()
+        async with session.request(method, path, params=params, data=data) as resp:
+            payload = await resp.json(content_type=None)
+
+        if payload.get('status') == 'error':
+            raise ex.GeneralException(
+                payload.get('message', 'Unknown error'),
+                code=resp.status
+            )
+        return payload['data']
+
+    async def _get(self, path, params=None):
+        return await self._request('GET', path, params=params)
+
+    async def _post(self, path, data=None):
+        return await self._request('POST', path, data=data)
+
+    async def _batched_get(self, path, instruments, batch_size):
+        """Split instruments into API-sized chunks and fetch them concurrently"""
+        chunks = [
+            instruments[i:i + batch_size]
+            for i in range(0, len(instruments), batch_size)
+        ]
+        results = await asyncio.gather(*[
+            self._get(path, params=[('i', instrument) for instrument in chunk])
+            for chunk in chunks
+        ])
+
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return merged
+
+    # ==================== Market Data Methods ====================
+
+    async def get_quote(self, *instruments):
+        """
+        Get quote for instruments
+
+        Args:
+            *instruments: Instrument codes (e.g., 'NSE:INFY', 'BSE:SENSEX')
+
+        Returns:
+            dict: Quote data
+        """
+        try:
+            quote = await self._batched_get('/quote', list(instruments), self.QUOTE_BATCH_SIZE)
+            logger.debug(
+                "quote_fetched",
+                instruments=list(instruments),
+                count=len(instruments)
+            )
+            return quote
+        except Exception as e:
+            logger.error(
+                "quote_fetch_failed",
+                instruments=list(instruments),
+                error=str(e),
+                exc_info=True
+            )
+            raise
+
+    async def get_ltp(self, *instruments):
+        """
+        Get last traded price for instruments
+
+        Args:
+            *instruments: Instrument codes (e.g., 'NSE:INFY')
+
+        Returns:
+            dict: LTP data
+        """
+        try:
+            return await self._batched_get('/quote/ltp', list(instruments), self.LTP_BATCH_SIZE)
+        except Exception as e:
+            logger.error("ltp_fetch_failed", error=str(e), exc_info=True)
+            raise
+
+    # ==================== Order Management Methods ====================
+
+    async def place_order(self, symbol, exchange, transaction_type, quantity,
+                          order_type='MARKET', product='CNC', price=None,
+                          trigger_price=None, validity='DAY', variety='regular'):
+        """
+        Place an order
+
+        Args:
+            Same as KiteTrader.place_order
+
+        Returns:
+            str: Order ID
+        """
+        params = {
+            'tradingsymbol': symbol,
+            'exchange': exchange,
+            'transaction_type': transaction_type,
+            'quantity': quantity,
+            'order_type': order_type,
+            'product': product,
+            'price': price,
+            'trigger_price': trigger_price,
+            'validity': validity
+        }
+        form = {k: v for k, v in params.items() if v is not None}
+
+        try:
+            data = await self._post(f'/orders/{variety}', data=form)
+            order_id = data['order_id']
+            logger.info(
+                "order_placed",
+                order_id=order_id,
+                symbol=symbol,
+                exchange=exchange,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                order_type=order_type,
+                product=product,
+                price=price
+            )
+            return order_id
+        except Exception as e:
+            logger.error(
+                "order_placement_failed",
+                symbol=symbol,
+                exchange=exchange,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                error=str(e),
+                exc_info=True
+            )
+            raise
+
+    async def place_orders_batch(self, orders):
+        """
+        Place several orders concurrently, within Kite's order rate limit
+
+        At most MAX_ORDERS_IN_FLIGHT requests are open at once, and sends
+        are paced to ORDER_RATE_LIMIT per second so a large batch is not
+        rejected by the API.
+
+        Args:
+            orders (list): List of dicts with place_order keyword arguments
+
+        Returns:
+            list: Order ID for each order, in input order; a failed order
+                comes back as its exception object rather than being raised,
+                so callers must check each entry
+        """
+        if self._order_limiter is None:
+            self._order_limiter = _AsyncTokenBucket(self.ORDER_RATE_LIMIT)
+            self._order_slots = asyncio.Semaphore(self.MAX_ORDERS_IN_FLIGHT)
+        limiter, slots = self._order_limiter, self._order_slots
+
+        async def place(order):
+            async with slots:
+                await limiter.acquire()
+                return await self.place_order(**order)
+
+        return await asyncio.gather(
+            *[place(order) for order in orders],
+            return_exceptions=True
+        )
+
+
+def _use_uvloop():
+    """Switch asyncio to uvloop's event loop when it is installed"""
+    try:
+        import uvloop
+    except ImportError:  # optional - stock asyncio loop otherwise
+        return False
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def run(coro):
+    """Run an AsyncKiteTrader coroutine from synchronous code, on uvloop if available"""
+    _use_uvloop()
+    return asyncio.run(coro)
+
+
+if __name__ == "__main__":
+    # Example usage
+
+    async def demo():
+        async with AsyncKiteTrader() as trader:
+            quote, ltp = await asyncio.gather(
+                trader.get_quote('NSE:INFY', 'NSE:TCS'),
+                trader.get_ltp('NSE:RELIANCE', 'NSE:SBIN', 'BSE:SENSEX')
+            )
+            logger.info("quote_fetched", quote=quote)
+            logger.info("ltp_fetched", ltp=ltp)
+
+    run(demo())
@@ -265,6 +265,25 @@ def get_logger(name=None):
     return structlog.get_logger(name)
 
 
+def is_enabled_for(logger, level):
+    """
+    Check whether a logger would emit records at the given level.
+    
+    Use this to guard logging inside hot loops so event kwargs are only
+    built when the record is actually emitted.
+    
+    Args:
+        logger: Logger returned by get_logger
+        level: stdlib logging level (e.g. logging.INFO)
+    
+    Returns:
+        bool: False only if the level is known to be filtered out
+    """
+    # Loggers created before setup_logging() have no level filtering
+    check = getattr(logger, "isEnabledFor", None)
+    return check(level) if check is not None else True
+
+
 # Example usage and best practices
 if __name__ == "__main__":
     # Setup logging
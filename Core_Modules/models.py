@@ -0,0 +1,138 @@
+"""
+Lightweight record types for Kite API responses
+
+The SDK returns positions and quotes as dicts that repeat the same keys for
+every row. These slotted, frozen records store only the fields strategies
+use, taking roughly half the memory of a dict and giving faster attribute
+access.
+"""
+from dataclasses import dataclass
+
+
+class _SlottedRecord:
+    """
+    Pickle/copy support for frozen records with hand-written __slots__
+
+    Without a __dict__, pickle and copy restore state with setattr, which
+    the frozen dataclass rejects; restore the fields with object.__setattr__.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class Position(_SlottedRecord):
+    """A single day or net position"""
+
+    __slots__ = (
+        'tradingsymbol', 'exchange', 'instrument_token', 'product',
+        'quantity', 'overnight_quantity', 'multiplier', 'average_price',
+        'close_price', 'last_price', 'value', 'pnl', 'm2m', 'unrealised',
+        'realised', 'buy_quantity', 'buy_price', 'sell_quantity', 'sell_price'
+    )
+
+    tradingsymbol: str
+    exchange: str
+    instrument_token: int
+    product: str
+    quantity: int
+    overnight_quantity: int
+    multiplier: float
+    average_price: float
+    close_price: float
+    last_price: float
+    value: float
+    pnl: float
+    m2m: float
+    unrealised: float
+    realised: float
+    buy_quantity: int
+    buy_price: float
+    sell_quantity: int
+    sell_price: float
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Position from a Kite position dict (missing keys become None)"""
+        return cls(*[data.get(name) for name in cls.__slots__])
+
+
+@dataclass(frozen=True)
+class Quote(_SlottedRecord):
+    """Market quote for one instrument, with OHLC flattened"""
+
+    __slots__ = (
+        'instrument', 'instrument_token', 'last_price', 'volume',
+        'average_price', 'buy_quantity', 'sell_quantity', 'net_change',
+        'open', 'high', 'low', 'close'
+    )
+
+    instrument: str
+    instrument_token: int
+    last_price: float
+    volume: int
+    average_price: float
+    buy_quantity: int
+    sell_quantity: int
+    net_change: float
+    open: float
+    high: float
+    low: float
+    close: float
+
+    @classmethod
+    def from_dict(cls, instrument, data):
+        """Build a Quote from a Kite quote dict keyed by `instrument`"""
+        ohlc = data.get('ohlc') or {}
+        return cls(
+            instrument,
+            data.get('instrument_token'),
+            data.get('last_price'),
+            data.get('volume'),
+            data.get('average_price'),
+            data.get('buy_quantity'),
+            data.get('sell_quantity'),
+            data.get('net_change'),
+            ohlc.get('open'),
+            ohlc.get('high'),
+            ohlc.get('low'),
+            ohlc.get('close')
+        )
+
+
+def positions_from_dicts(positions):
+    """
+    Convert a Kite positions response into Position records
+
+    Args:
+        positions (dict): {'day': [...], 'net': [...]} as returned by the SDK
+
+    Returns:
+        dict: Same shape with lists of Position
+    """
+    from_dict = Position.from_dict
+    return {
+        key: [from_dict(p) for p in rows]
+        for key, rows in positions.items()
+    }
+
+
+def quotes_from_dicts(quotes):
+    """
+    Convert a Kite quote response into Quote records
+
+    Args:
+        quotes (dict): Instrument code -> quote dict
+
+    Returns:
+        dict: Instrument code -> Quote
+    """
+    from_dict = Quote.from_dict
+    return {instrument: from_dict(instrument, data) for instrument, data in quotes.items()}
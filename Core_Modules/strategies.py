@@ -1,14 +1,25 @@
-import pandas as pd
 """
 Common trading strategies and helper functions
 """
+import functools
+import logging
+from typing import Optional
+import numpy as np
+import pandas as pd
 from .trader import KiteTrader
 from datetime import datetime, timedelta
-from .logger import get_logger
+from .logger import get_logger, is_enabled_for
+from ._kernels import momentum_scan, trail_sl as trail_sl_kernel
 
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _default_trader():
+    """Shared KiteTrader so repeated TradingStrategies() skip re-authentication"""
+    return KiteTrader()
+
+
 class TradingStrategies:
     """Collection of common trading strategies"""
 
@@ -35,8 +46,12 @@ class TradingStrategies:
         ha_df['ha_close'] = ha_close
         return ha_df[['ha_open', 'ha_high', 'ha_low', 'ha_close']]
 
-    def __init__(self):
-        self.trader = KiteTrader()
+    def __init__(self, trader: Optional[KiteTrader] = None):
+        """
+        Args:
+            trader: KiteTrader to use; defaults to a shared process-wide instance
+        """
+        self.trader = trader or _default_trader()
     
     def place_bracket_order(self, symbol, quantity, target_pct=3.0, sl_pct=1.5):
         """
@@ -51,14 +66,50 @@ class TradingStrategies:
         Returns:
             dict: Order details
         """
+        return self._bracket_inner(
+            symbol, quantity,
+            target_pct=target_pct,
+            sl_pct=sl_pct,
+            target_mult=1.0 + target_pct / 100.0,
+            sl_mult=1.0 - sl_pct / 100.0
+        )
+    
+    def compile_bracket(self, target_pct, sl_pct):
+        """
+        Specialize place_bracket_order for a fixed target and stop loss
+        
+        The price multipliers are computed once here instead of on every call,
+        which suits bots that trade a whole universe with the same settings:
+        
+            trade = strategy.compile_bracket(3.0, 1.5)
+            for symbol in universe:
+                trade(symbol, 1)
+        
+        Args:
+            target_pct: Target profit percentage
+            sl_pct: Stop loss percentage
+            
+        Returns:
+            callable: f(symbol, quantity) -> order details, as place_bracket_order
+        """
+        return functools.partial(
+            self._bracket_inner,
+            target_pct=target_pct,
+            sl_pct=sl_pct,
+            target_mult=1.0 + target_pct / 100.0,
+            sl_mult=1.0 - sl_pct / 100.0
+        )
+    
+    def _bracket_inner(self, symbol, quantity, *, target_pct, sl_pct, target_mult, sl_mult):
+        """Bracket order body with precomputed target/SL multipliers"""
         try:
             # Get current price
             ltp_data = self.trader.get_ltp(f'NSE:{symbol}')
             current_price = ltp_data[f'NSE:{symbol}']['last_price']
             
             # Calculate target and SL prices
-            target_price = round(current_price * (1 + target_pct/100), 2)
-            sl_price = round(current_price * (1 - sl_pct/100), 2)
+            target_price = round(current_price * target_mult, 2)
+            sl_price = round(current_price * sl_mult, 2)
             
             logger.info(
                 "calculating_bracket_order",
@@ -146,31 +197,38 @@ class TradingStrategies:
             # Get quotes
             quotes = self.trader.get_quote(*instruments)
             
-            momentum_stocks = []
+            rows = [
+                (instrument.partition(':')[2], data)
+                for instrument, data in quotes.items()
+                if 'ohlc' in data and 'last_price' in data
+            ]
+            if not rows:
+                return []
             
-            for instrument, data in quotes.items():
-                symbol = instrument.split(':')[1]
-                
-                if 'ohlc' in data and 'last_price' in data:
-                    open_price = data['ohlc']['open']
-                    current_price = data['last_price']
-                    
-                    if open_price > 0:
-                        change_pct = ((current_price - open_price) / open_price) * 100
-                        
-                        if abs(change_pct) >= threshold:
-                            momentum_stocks.append({
-                                'symbol': symbol,
-                                'current_price': current_price,
-                                'open_price': open_price,
-                                'change_pct': round(change_pct, 2),
-                                'volume': data.get('volume', 0),
-                                'high': data['ohlc']['high'],
-                                'low': data['ohlc']['low']
-                            })
-            
-            # Sort by absolute change percentage
-            momentum_stocks.sort(key=lambda x: abs(x['change_pct']), reverse=True)
+            # Compute % change for the whole universe in one pass
+            n = len(rows)
+            opens = np.fromiter((data['ohlc']['open'] for _, data in rows), dtype=np.float64, count=n)
+            lasts = np.fromiter((data['last_price'] for _, data in rows), dtype=np.float64, count=n)
+            
+            change, hit = momentum_scan(opens, lasts, float(threshold))
+            change_pct = np.round(change, 2)
+            
+            # Keep stocks over the threshold, sorted by absolute change percentage
+            hits = np.flatnonzero(hit)
+            hits = hits[np.argsort(-np.abs(change_pct[hits]), kind='stable')]
+            
+            momentum_stocks = []
+            for i in hits:
+                symbol, data = rows[i]
+                momentum_stocks.append({
+                    'symbol': symbol,
+                    'current_price': data['last_price'],
+                    'open_price': data['ohlc']['open'],
+                    'change_pct': float(change_pct[i]),
+                    'volume': data.get('volume', 0),
+                    'high': data['ohlc']['high'],
+                    'low': data['ohlc']['low']
+                })
             
             return momentum_stocks
             
@@ -178,7 +236,8 @@ class TradingStrategies:
             logger.error("momentum_strategy_failed", error=str(e), exc_info=True)
             raise
     
-    def trailing_stop_loss(self, symbol, quantity, initial_sl_pct=2.0, trail_pct=0.5):
+    def trailing_stop_loss(self, symbol, quantity, initial_sl_pct=2.0, trail_pct=0.5,
+                           positions_index=None):
         """
         Implement trailing stop loss logic
         
@@ -187,6 +246,8 @@ class TradingStrategies:
             quantity: Quantity held
             initial_sl_pct: Initial stop loss percentage
             trail_pct: Trailing percentage
+            positions_index: Result of trader.get_positions_indexed(as_objects=True),
+                shared across checks in the same tick; fetched if not given
             
         Returns:
             dict: Trailing SL details
@@ -197,13 +258,11 @@ class TradingStrategies:
             current_price = ltp_data[f'NSE:{symbol}']['last_price']
             
             # Get positions to find entry price
-            positions = self.trader.get_positions()
-            entry_price = None
+            if positions_index is None:
+                positions_index = self.trader.get_positions_indexed(as_objects=True)
             
-            for pos in positions['day']:
-                if pos['tradingsymbol'] == symbol and pos['quantity'] == quantity:
-                    entry_price = pos['average_price']
-                    break
+            pos = positions_index['day_by_symbol_qty'].get((symbol, quantity))
+            entry_price = pos.average_price if pos else None
             
             if not entry_price:
                 logger.warning("no_position_found_for_trailing_sl", symbol=symbol)
@@ -212,13 +271,10 @@ class TradingStrategies:
             # Calculate profit percentage
             profit_pct = ((current_price - entry_price) / entry_price) * 100
             
-            # Calculate trailing SL
-            if profit_pct > initial_sl_pct:
-                # Trail stop loss
-                trail_sl = round(current_price * (1 - trail_pct/100), 2)
-            else:
-                # Keep initial stop loss
-                trail_sl = round(entry_price * (1 - initial_sl_pct/100), 2)
+            # Trail above the initial SL once in profit, else keep the initial SL
+            trail_sl = round(
+                trail_sl_kernel(current_price, entry_price, initial_sl_pct, trail_pct), 2
+            )
             
             logger.info(
                 "trailing_sl_calculated",
@@ -246,8 +302,8 @@ class TradingStrategies:
         Square off all open positions (use with caution!)
         """
         try:
-            positions = self.trader.get_positions()
-            day_positions = [p for p in positions['day'] if p['quantity'] != 0]
+            positions = self.trader.get_positions(as_objects=True)
+            day_positions = [p for p in positions['day'] if p.quantity != 0]
             
             if not day_positions:
                 logger.info("no_positions_to_square_off")
@@ -258,11 +314,11 @@ class TradingStrategies:
             # UNCOMMENT TO ACTUALLY SQUARE OFF
             """
             for pos in day_positions:
-                symbol = pos['tradingsymbol']
-                quantity = abs(pos['quantity'])
+                symbol = pos.tradingsymbol
+                quantity = abs(pos.quantity)
                 
                 # Determine transaction type (opposite of current position)
-                if pos['quantity'] > 0:
+                if pos.quantity > 0:
                     # Long position - sell to square off
                     transaction_type = self.trader.kite.TRANSACTION_TYPE_SELL
                 else:
@@ -272,23 +328,24 @@ class TradingStrategies:
                 try:
                     order_id = self.trader.place_order(
                         symbol=symbol,
-                        exchange=pos['exchange'],
+                        exchange=pos.exchange,
                         transaction_type=transaction_type,
                         quantity=quantity,
                         order_type=self.trader.kite.ORDER_TYPE_MARKET,
-                        product=pos['product']
+                        product=pos.product
                     )
                     logger.info(f"Squared off {symbol}: Order ID {order_id}")
                 except Exception as e:
                     logger.error(f"Failed to square off {symbol}: {e}")
             """
             
-            for pos in day_positions:
-                logger.info(
-                    "would_square_off",
-                    symbol=pos['tradingsymbol'],
-                    quantity=pos['quantity']
-                )
+            if is_enabled_for(logger, logging.INFO):
+                for pos in day_positions:
+                    logger.info(
+                        "would_square_off",
+                        symbol=pos.tradingsymbol,
+                        quantity=pos.quantity
+                    )
             
         except Exception as e:
             logger.error("square_off_failed", error=str(e), exc_info=True)
@@ -304,14 +361,15 @@ if __name__ == "__main__":
     momentum = strategy.momentum_strategy(stocks, threshold=1.5)
     
     logger.info("momentum_stocks_found", count=len(momentum))
-    for stock in momentum:
-        logger.info(
-            "momentum_stock",
-            symbol=stock['symbol'],
-            change_pct=stock['change_pct'],
-            current_price=stock['current_price'],
-            volume=stock['volume']
-        )
+    if is_enabled_for(logger, logging.INFO):
+        for stock in momentum:
+            logger.info(
+                "momentum_stock",
+                symbol=stock['symbol'],
+                change_pct=stock['change_pct'],
+                current_price=stock['current_price'],
+                volume=stock['volume']
+            )
     
     # Example 2: Bracket order simulation
     logger.info("running_bracket_order_simulation")
@@ -2,21 +2,106 @@
 Trading module for executing trades on Zerodha Kite Connect
 """
 from kiteconnect import KiteConnect
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .auth import KiteAuth
 from .config import Config
 from .logger import get_logger
-import pandas as pd
+from ._kernels import candles_to_arrays
+from .models import positions_from_dicts, quotes_from_dicts
+from .websocket_ticker import KiteWebSocket
 
 logger = get_logger(__name__)
 
+# Persistent connections kept per host on the SDK's HTTP session
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 50
+
+
+class _OrjsonModule:
+    """Stand-in for the json module that decodes responses with orjson"""
+    
+    def __init__(self, stdlib_json, orjson_loads):
+        self._stdlib_json = stdlib_json
+        self._orjson_loads = orjson_loads
+    
+    def loads(self, s, **kwargs):
+        # orjson takes no options; keep stdlib behaviour for hooks etc.
+        if kwargs:
+            return self._stdlib_json.loads(s, **kwargs)
+        return self._orjson_loads(s)
+    
+    def __getattr__(self, name):
+        return getattr(self._stdlib_json, name)
+
+
+def _install_orjson_decoder():
+    """
+    Make KiteConnect decode REST responses with orjson when it is installed
+    
+    Large quote, positions and historical-data payloads spend most of their
+    client-side time in json.loads; orjson is several times faster.
+    Only the module-level json reference inside kiteconnect.connect is
+    swapped, so this is a no-op if the SDK changes how it decodes.
+    """
+    try:
+        import orjson
+        from kiteconnect import connect as kite_connect
+    except ImportError:
+        return
+    
+    current = getattr(kite_connect, 'json', None)
+    if current is None or isinstance(current, _OrjsonModule):
+        return
+    
+    kite_connect.json = _OrjsonModule(current, orjson.loads)
+    logger.debug("orjson_decoder_installed")
+
+
+def _mount_http_pool(kite):
+    """
+    Mount a keep-alive connection pool with retries on KiteConnect's session
+    
+    Concurrent callers (thread pools, the portfolio summary) otherwise
+    outgrow urllib3's default pool of 10 and pay a fresh TCP+TLS handshake
+    for each discarded connection. Only GETs are retried, so an order is
+    never resubmitted. Rate limiting (429) is not retried, and the last
+    response is returned rather than raised so kiteconnect still maps it
+    to its own exceptions.
+    """
+    session = getattr(kite, 'reqsession', None)
+    if session is None:
+        return
+    
+    retries = Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+
 
 class KiteTrader:
     """Main trading class for Zerodha Kite Connect"""
     
     def __init__(self):
         """Initialize trader with authenticated KiteConnect instance"""
+        _install_orjson_decoder()
         auth = KiteAuth()
         self.kite = auth.get_kite_instance()
+        _mount_http_pool(self.kite)
+        
+        # Live prices streamed by start_ticker, keyed by instrument token
+        self._ticker = None
+        self._ticker_tokens = {}
+        self._live_prices = {}
     
     # ==================== Market Data Methods ====================
     
@@ -47,15 +132,16 @@ class KiteTrader:
             )
             raise
     
-    def get_quote(self, *instruments):
+    def get_quote(self, *instruments, as_objects=False):
         """
         Get quote for instruments
         
         Args:
             *instruments: Instrument codes (e.g., 'NSE:INFY', 'BSE:SENSEX')
+            as_objects (bool): Return Quote records instead of dicts
             
         Returns:
-            dict: Quote data
+            dict: Quote data keyed by instrument code
         """
         try:
             quote = self.kite.quote(*instruments)
@@ -64,6 +150,8 @@ class KiteTrader:
                 instruments=list(instruments),
                 count=len(instruments)
             )
+            if as_objects:
+                return quotes_from_dicts(quote)
             return quote
         except Exception as e:
             logger.error(
@@ -85,7 +173,10 @@ class KiteTrader:
             dict: LTP data
         """
         try:
-            ltp = self.kite.ltp(*instruments)
+            ltp = self._live_ltp(instruments)
+            missing = [i for i in instruments if i not in ltp]
+            if missing:
+                ltp.update(self.kite.ltp(*missing))
             return ltp
         except Exception as e:
             logger.error(f"Failed to fetch LTP: {e}")
@@ -108,7 +199,8 @@ class KiteTrader:
             logger.error(f"Failed to fetch OHLC: {e}")
             raise
     
-    def get_historical_data(self, instrument_token, from_date, to_date, interval):
+    def get_historical_data(self, instrument_token, from_date, to_date, interval,
+                            as_array=False):
         """
         Get historical candle data
         
@@ -117,9 +209,11 @@ class KiteTrader:
             from_date (datetime/str): From date
             to_date (datetime/str): To date
             interval (str): Candle interval (minute, day, 3minute, 5minute, etc.)
+            as_array (bool): Return NumPy arrays instead of a list of dicts
             
         Returns:
-            list: Historical data
+            list: Historical data, or when as_array is True a tuple
+                (timestamps, ohlcv) - see _kernels.candles_to_arrays
         """
         try:
             data = self.kite.historical_data(
@@ -129,11 +223,85 @@ class KiteTrader:
                 interval=interval
             )
             logger.info(f"Fetched {len(data)} candles")
+            if as_array:
+                return candles_to_arrays(data)
             return data
         except Exception as e:
             logger.error(f"Failed to fetch historical data: {e}")
             raise
     
+    # ==================== Live Price Streaming ====================
+    
+    def start_ticker(self, instruments):
+        """
+        Stream prices over the Kite WebSocket so get_ltp can skip REST calls
+        
+        Args:
+            instruments (dict): Instrument code -> instrument token
+                (e.g., {'NSE:INFY': 408065})
+        """
+        self._ticker_tokens.update(instruments)
+        tokens = list(instruments.values())
+        
+        # Only LTP is read, so subscribe in MODE_LTP rather than the
+        # default MODE_FULL with market depth
+        if self._ticker is None:
+            self._ticker = KiteWebSocket(
+                on_ticks_callback=self._on_ticker_ticks,
+                on_connect_callback=self._on_ticker_connect,
+                on_close_callback=self._on_ticker_close
+            )
+            self._ticker.subscribe_with_mode(tokens, self._ticker.kws.MODE_LTP)
+            self._ticker.connect(threaded=True)
+        else:
+            self._ticker.subscribe_with_mode(tokens, self._ticker.kws.MODE_LTP)
+        
+        logger.info("ticker_started", count=len(self._ticker_tokens))
+    
+    def stop_ticker(self):
+        """Stop price streaming; get_ltp falls back to REST"""
+        ticker = self._ticker
+        self._ticker = None
+        self._ticker_tokens.clear()
+        self._live_prices.clear()
+        if ticker is not None:
+            ticker.close()
+    
+    def _on_ticker_ticks(self, ws, ticks):
+        """Record the last traded price of each tick"""
+        live_prices = self._live_prices
+        for tick in ticks:
+            live_prices[tick['instrument_token']] = tick['last_price']
+    
+    def _on_ticker_connect(self, ws, response):
+        """(Re)subscribe streamed tokens in LTP mode"""
+        tokens = list(self._ticker_tokens.values())
+        if tokens:
+            ws.subscribe(tokens)
+            ws.set_mode(ws.MODE_LTP, tokens)
+        logger.info("ticker_connected", count=len(tokens))
+    
+    def _on_ticker_close(self, ws, code, reason):
+        """
+        Drop streamed prices so stale values are never served
+        
+        The Twisted reactor is shared by every KiteTicker in the process and
+        cannot be restarted, so it is never stopped here; KiteTicker
+        reconnects on its own after a network drop.
+        """
+        self._live_prices.clear()
+        logger.info("ticker_closed", code=code, reason=reason)
+    
+    def _live_ltp(self, instruments):
+        """LTP data, in get_ltp's format, for instruments with a streamed price"""
+        ltp = {}
+        for instrument in instruments:
+            token = self._ticker_tokens.get(instrument)
+            price = self._live_prices.get(token)
+            if price is not None:
+                ltp[instrument] = {'instrument_token': token, 'last_price': price}
+        return ltp
+    
     # ==================== Order Management Methods ====================
     
     def place_order(self, symbol, exchange, transaction_type, quantity, 
@@ -280,10 +448,13 @@ class KiteTrader:
     
     # ==================== Portfolio Methods ====================
     
-    def get_positions(self):
+    def get_positions(self, as_objects=False):
         """
         Get current positions
         
+        Args:
+            as_objects (bool): Return Position records instead of dicts
+            
         Returns:
             dict: Positions (day and net)
         """
@@ -297,6 +468,8 @@ class KiteTrader:
                 net_positions=net_count,
                 total_positions=day_count + net_count
             )
+            if as_objects:
+                return positions_from_dicts(positions)
             return positions
         except Exception as e:
             logger.error(
@@ -306,6 +479,38 @@ class KiteTrader:
             )
             raise
     
+    def get_positions_indexed(self, as_objects=False):
+        """
+        Get current positions with hash indexes for O(1) lookups
+        
+        Fetch once per tick and share the result across strategy checks
+        instead of scanning the positions list for every lookup.
+        
+        Args:
+            as_objects (bool): Index Position records instead of dicts
+            
+        Returns:
+            dict: {
+                'day_by_symbol': {tradingsymbol: position},
+                'day_by_symbol_qty': {(tradingsymbol, quantity): position},
+                'raw': positions as returned by get_positions
+            }
+        """
+        positions = self.get_positions(as_objects=as_objects)
+        
+        # Iterate in reverse so the first matching position wins, as with a scan
+        day = positions.get('day', [])[::-1]
+        if as_objects:
+            keys = [(p.tradingsymbol, p.quantity) for p in day]
+        else:
+            keys = [(p['tradingsymbol'], p['quantity']) for p in day]
+        
+        return {
+            'day_by_symbol': {key[0]: p for key, p in zip(keys, day)},
+            'day_by_symbol_qty': dict(zip(keys, day)),
+            'raw': positions
+        }
+    
     def get_holdings(self):
         """
         Get holdings (long term positions)
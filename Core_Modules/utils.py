@@ -1,48 +1,230 @@
-import numpy as np
-
-def calculate_rsi(prices, period=14):
-    """
-    Calculate RSI (Relative Strength Index) for a list/array/Series of prices.
-    Args:
-        prices: List, numpy array, or pandas Series of closing prices
-        period: RSI period (default 14)
-    Returns:
-        numpy array of RSI values (same length as prices, first `period` values are np.nan)
-    """
-    prices = np.asarray(prices)
-    deltas = np.diff(prices)
-    seed = deltas[:period]
-    up = seed[seed > 0].sum() / period
-    down = -seed[seed < 0].sum() / period
-    rs = up / down if down != 0 else 0
-    rsi = np.zeros_like(prices)
-    rsi[:period] = np.nan
-    rsi[period] = 100. - 100. / (1. + rs)
-    for i in range(period + 1, len(prices)):
-        delta = deltas[i - 1]
-        if delta > 0:
-            upval = delta
-            downval = 0.
-        else:
-            upval = 0.
-            downval = -delta
-        up = (up * (period - 1) + upval) / period
-        down = (down * (period - 1) + downval) / period
-        rs = up / down if down != 0 else 0
-        rsi[i] = 100. - 100. / (1. + rs)
-    return rsi
 """
 Utility functions for trading operations
 """
 from .trader import KiteTrader
-import pandas as pd
-from datetime import datetime, timedelta
+import csv
+import functools
+import importlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from datetime import datetime, timedelta, timezone
 from .logger import get_logger
+from ._kernels import pct_change
 
 logger = get_logger(__name__)
 
+# Kite regenerates the instrument dumps daily; cached copies older than
+# this hour (IST) on the current day are refetched
+INSTRUMENT_REFRESH_HOUR = 8
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Shorter search terms are rejected instead of scanning every instrument
+MIN_SEARCH_LENGTH = 2
+
+# On-disk cache for instrument dumps, per user (XDG_CACHE_HOME or ~/.cache)
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'zerodha'
+)
+
+# exchange -> (loaded_at, DataFrame)
+_instrument_frames = {}
+
+# Instrument dump columns returned by search_instruments, and their output names
+_SEARCH_SOURCE_COLUMNS = ['tradingsymbol', 'name', 'instrument_token',
+                          'exchange', 'instrument_type']
+SEARCH_COLUMNS = ['symbol'] + _SEARCH_SOURCE_COLUMNS[1:]
+
+# Destinations supported by the position/holding exporters
+EXPORT_SINKS = ('csv', 'parquet', 'duckdb', 'postgres')
+
+# Order statuses that monitor_orders treats as still pending
+PENDING_STATUSES = frozenset({'OPEN', 'TRIGGER PENDING'})
+
+
+def ttl_cache(seconds, maxsize=256):
+    """
+    Decorator caching a function's results per arguments for a fixed time
+    
+    Like functools.lru_cache, but entries expire `seconds` after they were
+    computed, which suits API reads such as quotes (short TTL) or instrument
+    dumps (hours). Safe to call from several threads; concurrent misses on
+    the same key may each call the function.
+    
+    Args:
+        seconds: Time to live of a cached result
+        maxsize: Maximum number of cached argument combinations (LRU evicted)
+        
+    The wrapper exposes cache_clear() to drop all entries.
+    """
+    def decorator(fn):
+        cache = OrderedDict()  # key -> (expires_at, value)
+        lock = threading.Lock()
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return entry[1]
+            
+            value = fn(*args, **kwargs)
+            
+            with lock:
+                cache[key] = (now + seconds, value)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    
+    return decorator
+
 
-def search_instruments(trader, search_term, exchange='NSE'):
+def last_instrument_refresh(now=None):
+    """
+    Get the time of the most recent instrument dump refresh
+    
+    Args:
+        now: Epoch seconds to evaluate at (default: current time)
+        
+    Returns:
+        float: Epoch seconds of the latest INSTRUMENT_REFRESH_HOUR (IST)
+            at or before now
+    """
+    current = datetime.fromtimestamp(time.time() if now is None else now, IST)
+    refresh = current.replace(hour=INSTRUMENT_REFRESH_HOUR, minute=0,
+                              second=0, microsecond=0)
+    if refresh > current:
+        refresh -= timedelta(days=1)
+    return refresh.timestamp()
+
+
+def _instruments_table(trader, exchange):
+    """
+    Get the instrument dump for an exchange as an Arrow table, cached on disk
+    
+    The dump is a multi-MB download that changes once a day, so a Feather
+    copy written since the last refresh (see last_instrument_refresh) is
+    memory-mapped from CACHE_DIR instead.
+    
+    Args:
+        trader: KiteTrader instance
+        exchange: Exchange name (None for all exchanges)
+        
+    Returns:
+        pyarrow.Table: Instruments, expiry null where the SDK gives ''
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    
+    path = os.path.join(CACHE_DIR, f"instruments_{exchange or 'ALL'}.feather")
+    
+    try:
+        if os.path.getmtime(path) >= last_instrument_refresh():
+            return feather.read_table(path, memory_map=True)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("instrument_cache_read_failed", exchange=exchange, error=str(e))
+    
+    instruments = trader.get_instruments(exchange)
+    # Arrow needs a null for missing expiries; the SDK uses ''
+    table = pa.Table.from_pylist(
+        [{**i, 'expiry': i.get('expiry') or None} for i in instruments]
+    )
+    
+    # Written uncompressed so readers can memory-map it without decoding,
+    # and renamed into place so they never map a partly written file
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        os.close(fd)
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning("instrument_cache_write_failed", exchange=exchange, error=str(e))
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return table
+
+
+def get_instrument_tokens(trader, exchange, symbols=None):
+    """
+    Map trading symbols to instrument tokens for an exchange
+    
+    The symbol filter runs as one vectorized Arrow is_in over the cached
+    dump, and only the matching rows are converted to Python objects.
+    
+    Args:
+        trader: KiteTrader instance
+        exchange: Exchange name
+        symbols: Trading symbols to look up (default: all)
+        
+    Returns:
+        dict: tradingsymbol -> instrument_token (symbols not listed on the
+            exchange are omitted)
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    table = _instruments_table(trader, exchange).select(['tradingsymbol', 'instrument_token'])
+    if symbols is not None:
+        mask = pc.is_in(table['tradingsymbol'], value_set=pa.array(list(symbols), pa.string()))
+        table = table.filter(mask)
+    return dict(zip(table['tradingsymbol'].to_pylist(), table['instrument_token'].to_pylist()))
+
+
+def _instruments_frame(trader, exchange):
+    """
+    Get the instrument dump for an exchange as a DataFrame, cached in memory
+    
+    Upper-cased tradingsymbol/name columns are added once so searches do not
+    case-fold every row on every call.
+    
+    Args:
+        trader: KiteTrader instance
+        exchange: Exchange name
+        
+    Returns:
+        DataFrame: Instruments with extra '_ts_up' and '_nm_up' columns
+    """
+    cached = _instrument_frames.get(exchange)
+    if cached and cached[0] >= last_instrument_refresh():
+        return cached[1]
+    
+    loaded_at = time.time()
+    df = _instruments_table(trader, exchange).to_pandas()
+    df['_ts_up'] = df['tradingsymbol'].str.upper()
+    df['_nm_up'] = df['name'].fillna('').str.upper()
+    # A handful of distinct values repeated across every row
+    for column in ('exchange', 'segment', 'instrument_type'):
+        if column in df:
+            df[column] = df[column].astype('category')
+    
+    _instrument_frames[exchange] = (loaded_at, df)
+    return df
+
+
+def search_instruments(trader, search_term, exchange='NSE', as_frame=False):
     """
     Search for instruments by symbol or name
     
@@ -50,32 +232,42 @@ def search_instruments(trader, search_term, exchange='NSE'):
         trader: KiteTrader instance
         search_term: Search string
         exchange: Exchange to search in
+        as_frame: Return the matching rows as a DataFrame instead of dicts
         
     Returns:
-        list: Matching instruments
+        list: Matching instruments (empty for terms shorter than
+            MIN_SEARCH_LENGTH, which would match most of the dump), or a
+            DataFrame with the same columns if as_frame is True
     """
+    if not search_term or len(search_term) < MIN_SEARCH_LENGTH:
+        if search_term:
+            logger.warning("search_term_too_short", search_term=search_term,
+                           min_length=MIN_SEARCH_LENGTH)
+        return _empty_search_result() if as_frame else []
+    
     try:
-        instruments = trader.get_instruments(exchange)
+        df = _instruments_frame(trader, exchange)
         
         search_term = search_term.upper()
-        matches = []
-        
-        for instrument in instruments:
-            if (search_term in instrument['tradingsymbol'].upper() or 
-                search_term in instrument['name'].upper()):
-                matches.append({
-                    'symbol': instrument['tradingsymbol'],
-                    'name': instrument['name'],
-                    'instrument_token': instrument['instrument_token'],
-                    'exchange': instrument['exchange'],
-                    'instrument_type': instrument['instrument_type']
-                })
+        mask = (df['_ts_up'].str.contains(search_term, regex=False) |
+                df['_nm_up'].str.contains(search_term, regex=False))
         
-        return matches
+        matches = df.loc[mask, _SEARCH_SOURCE_COLUMNS]
+        matches = matches.rename(columns={'tradingsymbol': 'symbol'})
+        if as_frame:
+            return matches
+        return matches.to_dict('records')
         
     except Exception as e:
         logger.error("instrument_search_failed", error=str(e), exc_info=True)
-        return []
+        return _empty_search_result() if as_frame else []
+
+
+def _empty_search_result():
+    """Empty DataFrame with the columns search_instruments returns"""
+    import pandas as pd
+    
+    return pd.DataFrame(columns=SEARCH_COLUMNS)
 
 
 def get_top_gainers_losers(trader, symbols, top_n=5):
@@ -94,29 +286,41 @@ def get_top_gainers_losers(trader, symbols, top_n=5):
         instruments = [f'NSE:{s}' if ':' not in s else s for s in symbols]
         quotes = trader.get_quote(*instruments)
         
-        changes = []
-        
-        for instrument, data in quotes.items():
-            symbol = instrument.split(':')[1]
-            if 'ohlc' in data and 'last_price' in data:
-                open_price = data['ohlc']['open']
-                current_price = data['last_price']
-                
-                if open_price > 0:
-                    change_pct = ((current_price - open_price) / open_price) * 100
-                    changes.append({
-                        'symbol': symbol,
-                        'price': current_price,
-                        'change_pct': round(change_pct, 2),
-                        'volume': data.get('volume', 0)
-                    })
-        
-        # Sort by change percentage
-        changes.sort(key=lambda x: x['change_pct'], reverse=True)
+        rows = [
+            (instrument.partition(':')[2], data)
+            for instrument, data in quotes.items()
+            if 'ohlc' in data and 'last_price' in data and data['ohlc']['open'] > 0
+        ]
+        
+        # Change percentages for all symbols in one vectorized pass
+        n = len(rows)
+        opens = np.fromiter((data['ohlc']['open'] for _, data in rows), dtype=np.float64, count=n)
+        lasts = np.fromiter((data['last_price'] for _, data in rows), dtype=np.float64, count=n)
+        pcts = np.round(pct_change(lasts, opens), 2)
+        
+        records = [
+            {
+                'symbol': symbol,
+                'price': data['last_price'],
+                'change_pct': float(pct),
+                'volume': data.get('volume', 0)
+            }
+            for (symbol, data), pct in zip(rows, pcts)
+        ]
+        
+        k = min(top_n, n)
+        if k <= 0:
+            return {'gainers': [], 'losers': []}
+        
+        # O(N) selection of the k largest/smallest, then sort just those k
+        top = np.argpartition(pcts, n - k)[n - k:]
+        top = top[np.argsort(-pcts[top], kind='stable')]
+        bottom = np.argpartition(pcts, k - 1)[:k]
+        bottom = bottom[np.argsort(pcts[bottom], kind='stable')]
         
         return {
-            'gainers': changes[:top_n],
-            'losers': changes[-top_n:][::-1]
+            'gainers': [records[i] for i in top],
+            'losers': [records[i] for i in bottom]
         }
         
     except Exception as e:
@@ -124,6 +328,56 @@ def get_top_gainers_losers(trader, symbols, top_n=5):
         return {'gainers': [], 'losers': []}
 
 
+def calculate_position_sizes(trader, symbols, risk_amounts, sl_pcts):
+    """
+    Calculate position sizes for a basket of symbols with one LTP request
+    
+    Args:
+        trader: KiteTrader instance
+        symbols: List of trading symbols (NSE)
+        risk_amounts: Amount willing to risk in INR - one value or one per symbol
+        sl_pcts: Stop loss percentage - one value or one per symbol
+        
+    Returns:
+        list: Position size details per symbol (see calculate_position_size),
+            empty on failure
+    """
+    try:
+        keys = [f'NSE:{s}' for s in symbols]
+        ltp_data = trader.get_ltp(*keys)
+        
+        prices = np.array([ltp_data[k]['last_price'] for k in keys], dtype=np.float64)
+        sl_fraction = np.broadcast_to(np.asarray(sl_pcts, dtype=np.float64), prices.shape) / 100
+        risk_amounts = np.broadcast_to(np.asarray(risk_amounts, dtype=np.float64), prices.shape)
+        
+        # Calculate risk per share
+        risk_per_share = prices * sl_fraction
+        if np.any(risk_per_share <= 0):
+            raise ValueError("Stop loss percentage and price must be positive")
+        
+        # Calculate position size and total investment
+        quantities = (risk_amounts / risk_per_share).astype(np.int64)
+        total_investments = quantities * prices
+        risk_totals = quantities * risk_per_share
+        sl_prices = prices * (1 - sl_fraction)
+        
+        return [
+            {
+                'symbol': symbol,
+                'current_price': float(prices[i]),
+                'quantity': int(quantities[i]),
+                'total_investment': round(float(total_investments[i]), 2),
+                'risk_amount': round(float(risk_totals[i]), 2),
+                'sl_price': round(float(sl_prices[i]), 2)
+            }
+            for i, symbol in enumerate(symbols)
+        ]
+        
+    except Exception as e:
+        logger.error("position_size_calculation_failed", error=str(e), exc_info=True)
+        return []
+
+
 def calculate_position_size(trader, symbol, risk_amount, sl_pct):
     """
     Calculate position size based on risk amount and stop loss
@@ -137,41 +391,152 @@ def calculate_position_size(trader, symbol, risk_amount, sl_pct):
     Returns:
         dict: Position size details
     """
+    sizes = calculate_position_sizes(trader, [symbol], risk_amount, sl_pct)
+    return sizes[0] if sizes else None
+
+
+def calculate_rsi(prices, period=14):
+    """
+    Calculate RSI (Relative Strength Index) for a list/array/Series of prices.
+    Args:
+        prices: List, numpy array, or pandas Series of closing prices
+        period: RSI period (default 14)
+    Returns:
+        numpy array of RSI values (same length as prices, first `period` values are np.nan)
+    """
+    prices = np.asarray(prices)
+    deltas = np.diff(prices)
+    seed = deltas[:period]
+    up = seed[seed > 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rs = up / down if down != 0 else 0
+    rsi = np.zeros_like(prices)
+    rsi[:period] = np.nan
+    rsi[period] = 100. - 100. / (1. + rs)
+    for i in range(period + 1, len(prices)):
+        delta = deltas[i - 1]
+        if delta > 0:
+            upval = delta
+            downval = 0.
+        else:
+            upval = 0.
+            downval = -delta
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        rs = up / down if down != 0 else 0
+        rsi[i] = 100. - 100. / (1. + rs)
+    return rsi
+
+
+def _write_csv(f, rows, columns, header=True):
+    """Stream selected columns of row dicts to an open text file as CSV"""
+    writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+
+
+def _import_extra(module, extra):
+    """
+    Import a module shipped by an optional extra of the package
+    
+    Raises:
+        ImportError: Naming the extra to install when the module is missing
+    """
     try:
-        # Get current price
-        ltp_data = trader.get_ltp(f'NSE:{symbol}')
-        current_price = ltp_data[f'NSE:{symbol}']['last_price']
-        
-        # Calculate risk per share
-        risk_per_share = current_price * (sl_pct / 100)
-        
-        # Calculate position size
-        quantity = int(risk_amount / risk_per_share)
-        
-        # Calculate total investment
-        total_investment = quantity * current_price
-        
-        return {
-            'symbol': symbol,
-            'current_price': current_price,
-            'quantity': quantity,
-            'total_investment': round(total_investment, 2),
-            'risk_amount': round(quantity * risk_per_share, 2),
-            'sl_price': round(current_price * (1 - sl_pct/100), 2)
-        }
-        
-    except Exception as e:
-        logger.error("position_size_calculation_failed", error=str(e), exc_info=True)
-        return None
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is not installed; install the '{extra}' extra: "
+            f"pip install 'zerodha-algo[{extra}]'"
+        ) from e
 
 
-def export_positions_to_csv(trader, filename='positions.csv'):
+def _write_rows(rows, columns, filename, sink=None, connection=None, table=None,
+                categorical=()):
+    """
+    Write selected columns of row dicts to an export sink
+    
+    Sinks:
+        csv      - streamed straight from the dicts with the csv module
+        parquet  - through an Arrow table
+        duckdb   - DuckDB's native writer over an Arrow table; Parquet for a
+                   .parquet filename, else CSV
+        postgres - COPY FROM STDIN into `table` over a DB-API `connection`
+                   (psycopg2), without an intermediate file
+    
+    Args:
+        rows: List of dicts
+        columns: Keys to write, in order
+        filename: Output path (unused for postgres)
+        sink: One of EXPORT_SINKS; by default inferred from the filename
+        connection: Open database connection for the postgres sink
+        table: Destination table for the postgres sink; quoted as an
+            identifier along with the column names. The caller commits.
+        categorical: Low-cardinality string columns to dictionary-encode in
+            the Arrow table (parquet/duckdb sinks)
+    """
+    if sink is None:
+        sink = 'parquet' if filename.endswith('.parquet') else 'csv'
+    if sink not in EXPORT_SINKS:
+        raise ValueError(f"Unknown export sink: {sink}")
+    
+    if sink == 'csv':
+        with open(filename, 'w', newline='') as f:
+            _write_csv(f, rows, columns)
+        return
+    
+    if sink == 'postgres':
+        if connection is None or not table:
+            raise ValueError("postgres sink needs a connection and a table")
+        sql = _import_extra('psycopg2.sql', 'postgres')
+        statement = sql.SQL("COPY {} ({}) FROM STDIN WITH CSV").format(
+            sql.Identifier(table),
+            sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+        buffer = io.StringIO()
+        _write_csv(buffer, rows, columns, header=False)
+        buffer.seek(0)
+        # The caller owns the connection and decides when to commit
+        with connection.cursor() as cursor:
+            cursor.copy_expert(statement, buffer)
+        return
+    
+    import pyarrow as pa
+    
+    arrow_table = pa.Table.from_pylist([{c: row[c] for c in columns} for row in rows])
+    for name in categorical:
+        i = arrow_table.schema.get_field_index(name)
+        arrow_table = arrow_table.set_column(i, name, arrow_table[name].dictionary_encode())
+    
+    if sink == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(arrow_table, filename)
+    else:
+        duckdb = _import_extra('duckdb', 'duckdb')
+        relation = duckdb.from_arrow(arrow_table)
+        if filename.endswith('.parquet'):
+            relation.to_parquet(filename)
+        else:
+            relation.write_csv(filename)
+
+
+def export_positions_to_csv(trader, filename='positions.csv', sink=None,
+                            connection=None, table='positions'):
     """
     Export current positions to CSV file
     
     Args:
         trader: KiteTrader instance
-        filename: Output filename
+        filename: Output filename (use a .parquet suffix for Parquet)
+        sink: Export sink - 'csv', 'parquet', 'duckdb' or 'postgres'
+            (see _write_rows); inferred from filename by default
+        connection: Database connection for the postgres sink (not committed)
+        table: Destination table for the postgres sink
+        
+    Returns:
+        str: Output filename (table name for postgres), or None if nothing
+            was exported
     """
     try:
         positions = trader.get_positions()
@@ -181,30 +546,36 @@ def export_positions_to_csv(trader, filename='positions.csv'):
             logger.info("no_positions_to_export")
             return
         
-        # Convert to DataFrame
-        df = pd.DataFrame(day_positions)
-        
         # Select relevant columns
         columns = ['tradingsymbol', 'exchange', 'product', 'quantity', 
                   'average_price', 'last_price', 'pnl', 'day_change']
         
-        df = df[columns]
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
-        logger.info("positions_exported", filename=filename, count=len(day_positions))
+        _write_rows(day_positions, columns, filename, sink, connection, table,
+                    categorical=('exchange', 'product'))
+        target = table if sink == 'postgres' else filename
+        logger.info("positions_exported", target=target, sink=sink, count=len(day_positions))
+        return target
         
     except Exception as e:
         logger.error("positions_export_failed", error=str(e), exc_info=True)
 
 
-def export_holdings_to_csv(trader, filename='holdings.csv'):
+def export_holdings_to_csv(trader, filename='holdings.csv', sink=None,
+                           connection=None, table='holdings'):
     """
     Export holdings to CSV file
     
     Args:
         trader: KiteTrader instance
-        filename: Output filename
+        filename: Output filename (use a .parquet suffix for Parquet)
+        sink: Export sink - 'csv', 'parquet', 'duckdb' or 'postgres'
+            (see _write_rows); inferred from filename by default
+        connection: Database connection for the postgres sink (not committed)
+        table: Destination table for the postgres sink
+        
+    Returns:
+        str: Output filename (table name for postgres), or None if nothing
+            was exported
     """
     try:
         holdings = trader.get_holdings()
@@ -213,18 +584,15 @@ def export_holdings_to_csv(trader, filename='holdings.csv'):
             logger.info("no_holdings_to_export")
             return
         
-        # Convert to DataFrame
-        df = pd.DataFrame(holdings)
-        
         # Select relevant columns
         columns = ['tradingsymbol', 'exchange', 'quantity', 'average_price', 
                   'last_price', 'pnl', 't1_quantity', 'isin']
         
-        df = df[columns]
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
-        logger.info("holdings_exported", filename=filename, count=len(holdings))
+        _write_rows(holdings, columns, filename, sink, connection, table,
+                    categorical=('exchange',))
+        target = table if sink == 'postgres' else filename
+        logger.info("holdings_exported", target=target, sink=sink, count=len(holdings))
+        return target
         
     except Exception as e:
         logger.error("holdings_export_failed", error=str(e), exc_info=True)
@@ -241,23 +609,33 @@ def get_portfolio_summary(trader):
         dict: Portfolio summary
     """
     try:
-        # Get margins
-        margins = trader.get_margins('equity')
+        # Margins, positions and holdings are independent - fetch concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            margins_future = executor.submit(trader.get_margins, 'equity')
+            positions_future = executor.submit(trader.get_positions)
+            holdings_future = executor.submit(trader.get_holdings)
+            
+            margins = margins_future.result()
+            positions = positions_future.result()
+            holdings = holdings_future.result()
         
-        # Get positions
-        positions = trader.get_positions()
         day_positions = [p for p in positions['day'] if p['quantity'] != 0]
         net_positions = [p for p in positions['net'] if p['quantity'] != 0]
         
-        # Get holdings
-        holdings = trader.get_holdings()
-        
         # Calculate totals
         total_day_pnl = sum(p['pnl'] for p in day_positions)
         total_net_pnl = sum(p['pnl'] for p in net_positions)
-        total_holdings_pnl = sum(h['pnl'] for h in holdings)
-        total_investment = sum(h['average_price'] * h['quantity'] for h in holdings)
-        total_current_value = sum(h['last_price'] * h['quantity'] for h in holdings)
+        
+        # One float64 matrix of avg/last/qty/pnl, then vectorized reductions
+        h_arr = np.array(
+            [(h['average_price'], h['last_price'], h['quantity'], h['pnl'])
+             for h in holdings],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        avg, last, qty, pnl = h_arr.T
+        total_holdings_pnl = float(pnl.sum())
+        total_investment = float(avg @ qty)
+        total_current_value = float(last @ qty)
         
         # Calculate total capital used from positions
         total_capital_used = 0
@@ -303,40 +681,64 @@ def get_portfolio_summary(trader):
         return None
 
 
-def monitor_orders(trader, interval=5, max_checks=12):
+def monitor_orders(trader, interval=5, timeout=60, max_interval=30):
     """
     Monitor pending orders and log status
     
+    Polls every `interval` seconds while the pending set is changing and
+    backs off exponentially (with jitter, capped at `max_interval`) while
+    it is not, so quiet order books cost fewer API calls.
+    
     Args:
         trader: KiteTrader instance
-        interval: Check interval in seconds
-        max_checks: Maximum number of checks
+        interval: Base check interval in seconds
+        timeout: Stop monitoring after this many seconds
+        max_interval: Upper bound for the backed-off interval in seconds
     """
-    import time
-    
     try:
-        for i in range(max_checks):
+        deadline = time.monotonic() + timeout
+        delay = interval
+        previous = None
+        check = 0
+        
+        while True:
+            check += 1
             orders = trader.get_orders()
-            pending = [o for o in orders if o['status'] in ['OPEN', 'TRIGGER PENDING']]
+            pending = [o for o in orders if o['status'] in PENDING_STATUSES]
             
             if not pending:
                 logger.info("no_pending_orders")
                 break
             
-            logger.info("pending_orders_check", check=i+1, max_checks=max_checks, count=len(pending))
+            # One event per poll carrying every pending order
+            logger.info(
+                "pending_orders_snapshot",
+                check=check,
+                count=len(pending),
+                orders=[
+                    {
+                        'symbol': o['tradingsymbol'],
+                        'status': o['status'],
+                        'transaction': o['transaction_type'],
+                        'quantity': o['quantity'],
+                        'price': o.get('price', o.get('trigger_price', 'MARKET'))
+                    }
+                    for o in pending
+                ]
+            )
             
-            for order in pending:
-                logger.info(
-                    "pending_order_status",
-                    symbol=order['tradingsymbol'],
-                    status=order['status'],
-                    transaction=order['transaction_type'],
-                    quantity=order['quantity'],
-                    price=order.get('price', order.get('trigger_price', 'MARKET'))
-                )
+            # Reset to the base interval whenever the pending set changes
+            snapshot = {(o['order_id'], o['status']) for o in pending}
+            if snapshot != previous:
+                delay = interval
+            else:
+                delay = min(delay * 1.5 + random.uniform(0, 0.5), max_interval)
+            previous = snapshot
             
-            if i < max_checks - 1:
-                time.sleep(interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
         
     except Exception as e:
         logger.error("order_monitoring_failed", error=str(e), exc_info=True)
@@ -1,19 +1,185 @@
 """
 WebSocket ticker module for real-time market data streaming
 """
+import logging
+import struct
+import numpy as np
 from kiteconnect import KiteTicker
 from .auth import KiteAuth
 from .config import Config
-from .logger import get_logger
+from .logger import get_logger, is_enabled_for
 
 logger = get_logger(__name__)
 
+# Recent ticks kept by the default on_ticks handler
+TICK_DTYPE = np.dtype([('tok', 'i8'), ('px', 'f8'), ('vol', 'i8')])
+TICK_BUFFER_SIZE = 4096
+
+# Decoded ticks handed to on_ticks when KiteWebSocket(array_ticks=True)
+TICK_ARRAY_DTYPE = np.dtype([
+    ('instrument_token', 'u4'), ('tradable', '?'),
+    ('last_price', 'f8'), ('last_traded_quantity', 'u4'),
+    ('average_traded_price', 'f8'), ('volume_traded', 'u4'),
+    ('total_buy_quantity', 'u4'), ('total_sell_quantity', 'u4'),
+    ('open', 'f8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8'),
+    ('change', 'f8'), ('last_trade_time', 'u4'), ('oi', 'u4'),
+    ('oi_day_high', 'u4'), ('oi_day_low', 'u4'), ('exchange_timestamp', 'u4')
+])
+
+_PRICE_FIELDS = ('last_price', 'average_traded_price', 'open', 'high', 'low', 'close')
+
+# Segment ids (low byte of the token) with non-paise price scaling
+_SEGMENT_CDS, _SEGMENT_BCD, _SEGMENT_INDICES = 3, 6, 9
+
+
+def _packet_dtype(fields):
+    """Big-endian layout of one length-prefixed packet in a binary frame"""
+    return np.dtype([('_len', '>u2')] + [(name, '>u4') for name in fields])
+
+
+_QUOTE_FIELDS = (
+    'instrument_token', 'last_price', 'last_traded_quantity',
+    'average_traded_price', 'volume_traded', 'total_buy_quantity',
+    'total_sell_quantity', 'open', 'high', 'low', 'close'
+)
+_INDEX_FIELDS = (
+    'instrument_token', 'last_price', 'high', 'low', 'open', 'close', '_price_change'
+)
+
+# Packet length -> layout (LTP, index quote, index full, quote, full)
+_PACKET_DTYPES = {
+    8: _packet_dtype(('instrument_token', 'last_price')),
+    28: _packet_dtype(_INDEX_FIELDS),
+    32: _packet_dtype(_INDEX_FIELDS + ('exchange_timestamp',)),
+    44: _packet_dtype(_QUOTE_FIELDS),
+    184: np.dtype(_packet_dtype(_QUOTE_FIELDS + (
+        'last_trade_time', 'oi', 'oi_day_high', 'oi_day_low', 'exchange_timestamp'
+    )).descr + [('_depth', 'V120')]),
+}
+
+
+def _packet_struct(dtype):
+    """Precompiled unpacker for a packet layout and its TICK_ARRAY_DTYPE positions"""
+    names = [name for name in dtype.names if name not in ('_len', '_depth')]
+    positions = tuple(
+        TICK_ARRAY_DTYPE.names.index(name) if name in TICK_ARRAY_DTYPE.names else None
+        for name in names
+    )
+    return struct.Struct('>' + 'I' * len(names)).unpack_from, positions
+
+
+# Packet length -> (unpack_from, field positions), for frames of mixed lengths
+_PACKET_STRUCTS = {size: _packet_struct(dtype) for size, dtype in _PACKET_DTYPES.items()}
+
+# Big-endian packet count / packet length prefix
+_unpack_short = struct.Struct('>H').unpack_from
+
+
+def _copy_fields(out, raw):
+    for name in raw.dtype.names:
+        if name in TICK_ARRAY_DTYPE.names:
+            out[name] = raw[name]
+
+
+def parse_ticks(payload):
+    """
+    Decode a Kite binary market data frame into a structured array
+    
+    Frames whose packets all share one length (the usual case, since every
+    token is subscribed in the same mode) are decoded as a single zero-copy
+    NumPy view; mixed frames are decoded packet by packet. Market depth is
+    not decoded.
+    
+    Args:
+        payload (bytes): Binary WebSocket message
+        
+    Returns:
+        numpy.ndarray: One TICK_ARRAY_DTYPE row per recognised packet
+    """
+    if len(payload) < 4:
+        return np.zeros(0, dtype=TICK_ARRAY_DTYPE)
+    
+    count = _unpack_short(payload, 0)[0]
+    size = _unpack_short(payload, 2)[0]
+    raw_dtype = _PACKET_DTYPES.get(size)
+    if raw_dtype is not None and len(payload) == 2 + count * raw_dtype.itemsize:
+        raw = np.frombuffer(payload, dtype=raw_dtype, count=count, offset=2)
+        if (raw['_len'] == size).all():
+            out = np.zeros(count, dtype=TICK_ARRAY_DTYPE)
+            _copy_fields(out, raw)
+            return _scale_ticks(out)
+    
+    # Mixed packet lengths - walk the frame with the precompiled unpackers
+    width = len(TICK_ARRAY_DTYPE.names)
+    rows = []
+    offset = 2
+    for _ in range(count):
+        size = _unpack_short(payload, offset)[0]
+        entry = _PACKET_STRUCTS.get(size)
+        if entry is not None:
+            unpack_from, positions = entry
+            row = [0] * width
+            for pos, value in zip(positions, unpack_from(payload, offset + 2)):
+                if pos is not None:
+                    row[pos] = value
+            rows.append(tuple(row))
+        offset += 2 + size
+    return _scale_ticks(np.array(rows, dtype=TICK_ARRAY_DTYPE))
+
+
+def _scale_ticks(ticks):
+    """Convert integer prices to rupees and derive tradable/change in place"""
+    segment = ticks['instrument_token'] & 0xff
+    divisor = np.where(segment == _SEGMENT_CDS, 1e7,
+                       np.where(segment == _SEGMENT_BCD, 1e4, 100.0))
+    for name in _PRICE_FIELDS:
+        ticks[name] /= divisor
+    
+    ticks['tradable'] = segment != _SEGMENT_INDICES
+    close = ticks['close']
+    np.divide((ticks['last_price'] - close) * 100.0, close,
+              out=ticks['change'], where=close != 0)
+    return ticks
+
+
+class TickView:
+    """Dict-style read access to one row of a tick array"""
+    
+    __slots__ = ('_row',)
+    
+    def __init__(self, row):
+        self._row = row
+    
+    def __getitem__(self, key):
+        row = self._row
+        if key == 'ohlc':
+            return {'open': row['open'], 'high': row['high'],
+                    'low': row['low'], 'close': row['close']}
+        if key not in TICK_ARRAY_DTYPE.names:
+            raise KeyError(key)
+        return row[key]
+    
+    def __contains__(self, key):
+        return key == 'ohlc' or key in TICK_ARRAY_DTYPE.names
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def tick_views(ticks):
+    """Wrap a tick array for code written against the SDK's tick dicts"""
+    return [TickView(row) for row in ticks]
+
 
 class KiteWebSocket:
     """WebSocket client for real-time market data"""
     
     def __init__(self, on_ticks_callback=None, on_connect_callback=None, 
-                 on_close_callback=None, on_error_callback=None):
+                 on_close_callback=None, on_error_callback=None,
+                 array_ticks=False):
         """
         Initialize WebSocket ticker
         
@@ -22,6 +188,8 @@ class KiteWebSocket:
             on_connect_callback: Callback function on connection
             on_close_callback: Callback function on close
             on_error_callback: Callback function on error
+            array_ticks: Deliver ticks to on_ticks as a TICK_ARRAY_DTYPE
+                structured array (see parse_ticks) instead of a list of dicts
         """
         auth = KiteAuth()
         
@@ -36,24 +204,68 @@ class KiteWebSocket:
         self.kws.on_close = on_close_callback or self.on_close
         self.kws.on_error = on_error_callback or self.on_error
         
-        self.subscribed_tokens = []
+        if array_ticks:
+            # KiteTicker decodes frames through this method before on_ticks
+            if hasattr(self.kws, '_parse_binary'):
+                self.kws._parse_binary = parse_ticks
+            else:
+                logger.warning("array_ticks_unsupported")
+        
+        self.subscribed_tokens = set()
+        
+        # Ring buffer of (token, price, volume); _tick_count is the total written
+        self._tick_buf = np.empty(TICK_BUFFER_SIZE, dtype=TICK_DTYPE)
+        self._tick_count = 0
     
     def on_ticks(self, ws, ticks):
         """
         Default callback to receive ticks
         
+        Ticks are written into a fixed-size ring buffer (see recent_ticks)
+        and logged once per batch rather than once per tick.
+        
         Args:
             ws: WebSocket instance
-            ticks: List of tick data
+            ticks: List of tick data, or a tick array with array_ticks
         """
+        buf = self._tick_buf
+        size = len(buf)
+        n = self._tick_count
+        if isinstance(ticks, np.ndarray):
+            batch = ticks[-size:]
+            idx = (n + len(ticks) - len(batch) + np.arange(len(batch))) % size
+            buf['tok'][idx] = batch['instrument_token']
+            buf['px'][idx] = batch['last_price']
+            buf['vol'][idx] = batch['volume_traded']
+            n += len(ticks)
+        else:
+            for tick in ticks:
+                try:
+                    buf[n % size] = (tick['instrument_token'], tick['last_price'],
+                                     tick.get('volume_traded', 0))
+                except KeyError:
+                    continue
+                n += 1
+        self._tick_count = n
+        
         logger.info("ticks_received", count=len(ticks))
-        for tick in ticks:
-            logger.debug(
-                "tick_received",
-                instrument_token=tick.get('instrument_token'),
-                last_price=tick.get('last_price'),
-                volume=tick.get('volume')
-            )
+        if is_enabled_for(logger, logging.DEBUG):
+            logger.debug("ticks_batch", count=len(ticks), total=n)
+    
+    def recent_ticks(self):
+        """
+        Get the ticks buffered by the default on_ticks handler
+        
+        Returns:
+            numpy.ndarray: Structured array (tok, px, vol), oldest first,
+                holding at most TICK_BUFFER_SIZE ticks
+        """
+        size = len(self._tick_buf)
+        n = self._tick_count
+        if n <= size:
+            return self._tick_buf[:n].copy()
+        start = n % size
+        return np.concatenate((self._tick_buf[start:], self._tick_buf[:start]))
     
     def on_connect(self, ws, response):
         """
@@ -65,27 +277,32 @@ class KiteWebSocket:
         """
         logger.info("websocket_connected", response=response)
         
-        # Subscribe to tokens if any were set before connection
+        # Subscribe to tokens if any were set before connection; Kite's mode
+        # message only changes the mode of already subscribed tokens
         if self.subscribed_tokens:
-            ws.subscribe(self.subscribed_tokens)
-            ws.set_mode(ws.MODE_FULL, self.subscribed_tokens)
+            tokens = list(self.subscribed_tokens)
+            ws.subscribe(tokens)
+            ws.set_mode(ws.MODE_FULL, tokens)
             logger.info(
                 "subscribed_on_connect",
-                count=len(self.subscribed_tokens),
-                tokens=self.subscribed_tokens
+                count=len(tokens),
+                tokens=tokens
             )
     
     def on_close(self, ws, code, reason):
         """
         Default callback on connection close
         
+        The Twisted reactor is shared by every KiteTicker in the process and
+        cannot be restarted, so it is not stopped here; call close() to end
+        this connection.
+        
         Args:
             ws: WebSocket instance
             code: Close code
             reason: Close reason
         """
         logger.info("connection_closed", code=code, reason=reason)
-        ws.stop()
     
     def on_error(self, ws, code, reason):
         """
@@ -108,12 +325,46 @@ class KiteWebSocket:
         if isinstance(instrument_tokens, int):
             instrument_tokens = [instrument_tokens]
         
-        self.subscribed_tokens.extend(instrument_tokens)
+        self.subscribed_tokens.update(instrument_tokens)
+        
+        if self.kws.is_connected():
+            self.kws.subscribe(instrument_tokens)
+            logger.info(
+                "subscribed",
+                count=len(instrument_tokens),
+                tokens=instrument_tokens
+            )
+        else:
+            logger.info(
+                "tokens_added_offline",
+                count=len(instrument_tokens),
+                tokens=instrument_tokens
+            )
+    
+    def subscribe_with_mode(self, instrument_tokens, mode=None):
+        """
+        Subscribe to instrument tokens and set their streaming mode
+        
+        Sends subscribe followed by mode, as KiteTicker's own resubscribe()
+        does: Kite's mode message only changes the mode of tokens that are
+        already subscribed.
+        
+        Args:
+            instrument_tokens (list): List of instrument tokens
+            mode: MODE_LTP, MODE_QUOTE, or MODE_FULL (default MODE_FULL)
+        """
+        if isinstance(instrument_tokens, int):
+            instrument_tokens = [instrument_tokens]
+        
+        mode = mode or self.kws.MODE_FULL
+        self.subscribed_tokens.update(instrument_tokens)
         
         if self.kws.is_connected():
             self.kws.subscribe(instrument_tokens)
+            self.kws.set_mode(mode, instrument_tokens)
             logger.info(
                 "subscribed",
+                mode=mode,
                 count=len(instrument_tokens),
                 tokens=instrument_tokens
             )
@@ -135,10 +386,7 @@ class KiteWebSocket:
             instrument_tokens = [instrument_tokens]
         
         self.kws.unsubscribe(instrument_tokens)
-        
-        for token in instrument_tokens:
-            if token in self.subscribed_tokens:
-                self.subscribed_tokens.remove(token)
+        self.subscribed_tokens.difference_update(instrument_tokens)
         
         logger.info(
             "unsubscribed",
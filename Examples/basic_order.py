@@ -1,15 +1,9 @@
 """
 Example: Place a basic market order
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from Core_Modules.trader import KiteTrader
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 
 def main():
     # Initialize trader
@@ -76,4 +70,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Only when run directly; the launcher imports this module in-process
+    logging.basicConfig(level=logging.INFO)
     main()
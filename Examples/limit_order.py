@@ -1,18 +1,67 @@
 """
 Example: Place limit orders with stop loss
 """
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from Core_Modules.trader import KiteTrader
+from Core_Modules.utils import PENDING_STATUSES, ttl_cache
 from kiteconnect import KiteConnect
 import logging
 
-logging.basicConfig(level=logging.INFO)
+# Kite allows 10 order requests per second
+ORDER_RATE_LIMIT = 10
 
+# Order requests per symbol: the limit buy and its stop loss
+ORDER_LEGS = 2
 
-def place_limit_order_with_sl(trader, symbol, quantity, limit_price, sl_price):
+# NSE equity tick size, in paise
+TICK_PAISE = 5
+
+
+class TokenBucket:
+    """Thread-safe token bucket for client-side request rate limiting"""
+    
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+order_limiter = TokenBucket(ORDER_RATE_LIMIT)
+
+
+@ttl_cache(1.0)
+def _quote(trader, *instruments):
+    """Quotes for instruments, reused for up to a second"""
+    return trader.get_quote(*instruments)
+
+
+def place_limit_order_with_sl(trader, symbol, quantity, limit_price, sl_price,
+                              emit=print):
     """
     Place a limit buy order with stop loss
     
@@ -22,11 +71,12 @@ def place_limit_order_with_sl(trader, symbol, quantity, limit_price, sl_price):
         quantity: Quantity to buy
         limit_price: Limit price for buy order
         sl_price: Stop loss price
+        emit: Called with each output line (default print)
     """
-    print(f"\n=== Placing Limit Order for {symbol} ===")
-    print(f"Quantity: {quantity}")
-    print(f"Limit Price: ₹{limit_price}")
-    print(f"Stop Loss: ₹{sl_price}")
+    emit(f"\n=== Placing Limit Order for {symbol} ===")
+    emit(f"Quantity: {quantity}")
+    emit(f"Limit Price: ₹{limit_price}")
+    emit(f"Stop Loss: ₹{sl_price}")
     
     # UNCOMMENT WHEN READY TO PLACE ACTUAL ORDERS
     """
@@ -39,7 +89,7 @@ def place_limit_order_with_sl(trader, symbol, quantity, limit_price, sl_price):
             exchange='NSE',
             product='MIS'  # MIS for intraday
         )
-        print(f"✓ Buy order placed! Order ID: {buy_order_id}")
+        emit(f"✓ Buy order placed! Order ID: {buy_order_id}")
         
         # Wait for order to execute (in real scenario, you'd monitor order status)
         # Then place stop loss order
@@ -54,47 +104,110 @@ def place_limit_order_with_sl(trader, symbol, quantity, limit_price, sl_price):
             product='MIS',
             trigger_price=sl_price
         )
-        print(f"✓ Stop loss order placed! Order ID: {sl_order_id}")
+        emit(f"✓ Stop loss order placed! Order ID: {sl_order_id}")
         
         return buy_order_id, sl_order_id
         
     except Exception as e:
-        print(f"✗ Order failed: {e}")
+        emit(f"✗ Order failed: {e}")
         return None, None
     """
-    print("(Orders are commented out for safety)")
+    emit("(Orders are commented out for safety)")
+
+
+def price_ladder(prices, limit_bps=100, sl_bps=200):
+    """
+    Limit and stop loss prices for a batch of last traded prices
+    
+    Works in integer paise so every level is exact and snapped down to
+    TICK_PAISE, which the exchange requires.
+    
+    Args:
+        prices: Last traded prices in rupees
+        limit_bps: Limit price discount below LTP, in basis points
+        sl_bps: Stop loss distance below the limit price, in basis points
+        
+    Returns:
+        tuple: (limit_prices, sl_prices) as float64 arrays in rupees
+    """
+    paise = np.rint(np.asarray(prices, dtype=np.float64) * 100).astype(np.int64)
+    limit = paise * (10000 - limit_bps) // 10000
+    limit -= limit % TICK_PAISE
+    sl = limit * (10000 - sl_bps) // 10000
+    sl -= sl % TICK_PAISE
+    return limit / 100, sl / 100
+
+
+def _place_rate_limited(trader, spec):
+    """
+    Executor task: take order_limiter tokens for both legs, then place them
+    
+    Output is buffered and returned so concurrent symbols do not interleave.
+    
+    Returns:
+        tuple: (result of place_limit_order_with_sl, output lines)
+    """
+    for _ in range(ORDER_LEGS):
+        order_limiter.acquire()
+    lines = []
+    result = place_limit_order_with_sl(trader, *spec, emit=lines.append)
+    return result, lines
+
+
+def place_limit_orders_with_sl(trader, specs, max_workers=ORDER_RATE_LIMIT):
+    """
+    Place limit-with-stop-loss orders for several symbols concurrently
+    
+    Each symbol's buy and stop loss legs stay sequential; different symbols
+    are placed in parallel so their network round-trips overlap. Requests
+    share trader's HTTP session and are throttled by order_limiter. Each
+    symbol's output is printed in input order once all orders are done.
+    
+    Args:
+        trader: KiteTrader instance
+        specs: List of (symbol, quantity, limit_price, sl_price) tuples
+        max_workers: Maximum orders in flight
+        
+    Returns:
+        list: Result of place_limit_order_with_sl per spec, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_place_rate_limited, trader, spec) for spec in specs]
+        outcomes = [future.result() for future in futures]
+    
+    results = []
+    for result, lines in outcomes:
+        print('\n'.join(lines))
+        results.append(result)
+    return results
 
 
 def main():
     # Initialize trader
     trader = KiteTrader()
     
-    # Example: Get current price first
-    symbol = 'INFY'
-    quote = trader.get_quote(f'NSE:{symbol}')
-    current_price = quote[f'NSE:{symbol}']['last_price']
-    
-    print(f"\n{symbol} Current Price: ₹{current_price}")
+    # Example: Get current prices first (one request for all symbols)
+    symbols = ['INFY', 'TCS', 'RELIANCE']
+    quote = _quote(trader, *[f'NSE:{symbol}' for symbol in symbols])
     
-    # Set limit price slightly below current price (for buy order)
-    limit_price = round(current_price * 0.99, 2)  # 1% below current price
+    prices = [quote[f'NSE:{symbol}']['last_price'] for symbol in symbols]
+    for symbol, current_price in zip(symbols, prices):
+        print(f"\n{symbol} Current Price: ₹{current_price}")
     
-    # Set stop loss 2% below limit price
-    sl_price = round(limit_price * 0.98, 2)
+    # Limit 1% below current price (for buy order), stop loss 2% below limit
+    limit_prices, sl_prices = price_ladder(prices, limit_bps=100, sl_bps=200)
+    specs = [
+        (symbol, 1, float(limit_price), float(sl_price))
+        for symbol, limit_price, sl_price in zip(symbols, limit_prices, sl_prices)
+    ]
     
-    # Place order
-    place_limit_order_with_sl(
-        trader=trader,
-        symbol=symbol,
-        quantity=1,
-        limit_price=limit_price,
-        sl_price=sl_price
-    )
+    # Place orders
+    place_limit_orders_with_sl(trader, specs)
     
     # Show pending orders
     print("\n=== Pending Orders ===")
     orders = trader.get_orders()
-    pending_orders = [o for o in orders if o['status'] in ['TRIGGER PENDING', 'OPEN']]
+    pending_orders = [o for o in orders if o['status'] in PENDING_STATUSES]
     
     for order in pending_orders:
         print(f"Order ID: {order['order_id']}")
@@ -107,4 +220,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Only when run directly; the launcher imports this module in-process
+    logging.basicConfig(level=logging.INFO)
     main()
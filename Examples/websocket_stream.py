@@ -2,14 +2,40 @@
 Example: Real-time market data streaming using WebSocket
 """
 import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import queue
+import threading
+import time
+from operator import itemgetter
 
+import numpy as np
 from Core_Modules.websocket_ticker import KiteWebSocket
 from Core_Modules.trader import KiteTrader
+from Core_Modules.utils import get_instrument_tokens, ttl_cache
+from Core_Modules._kernels import update_tick_stats, STAT_TICKS, STAT_VAR
 import logging
 
-logging.basicConfig(level=logging.INFO)
+# Output templates for on_ticks, bound once instead of re-built per tick
+_TICK_HEADER = ("\n--- {} ---\nInstrument Token: {}\nLast Price: ₹{}\n"
+                "Volume: {:,}\nChange: {:.2f}%").format
+_TICK_OHLC = "OHLC: O={}, H={}, L={}, C={}".format
+_DEPTH_LEVEL = "    {}. Price: ₹{}, Qty: {}, Orders: {}".format
+_depth_fields = itemgetter('price', 'quantity', 'orders')
+_TICK_STATS = "Ticks: {:.0f}, Volatility (EWMA): {:.4f}%".format
+
+# Smoothing factor for the rolling per-instrument tick statistics
+STATS_ALPHA = 0.05
+
+# Ticks waiting to be rendered; newer ticks are dropped once this many queue up
+TICK_QUEUE_SIZE = 1024
+
+# Queued by stop_rendering to end the render thread
+_STOP = object()
+
+
+@ttl_cache(8 * 60 * 60)
+def _instrument_tokens(trader, exchange, symbols):
+    """Token lookup for a tuple of symbols, reused for the trading session"""
+    return get_instrument_tokens(trader, exchange, symbols)
 
 
 class MarketDataStream:
@@ -18,6 +44,38 @@ class MarketDataStream:
     def __init__(self):
         self.trader = KiteTrader()
         self.instrument_tokens = []
+        self._token_index = {}
+        self._kws = None
+        
+        # on_ticks (socket thread) hands ticks to _render_loop via this queue
+        self._tick_q = queue.Queue(maxsize=TICK_QUEUE_SIZE)
+        self._dropped = 0
+        self._render_thread = None
+        
+        # Rolling stats per streamed instrument (see update_tick_stats)
+        self._slots = {}
+        self._stats = np.zeros((0, 4))
+    
+    def _build_token_index(self, symbols):
+        """
+        Look up instrument tokens for symbols that are not indexed yet
+        
+        Each exchange's dump is loaded from the daily on-disk cache and
+        filtered for all of its wanted symbols in one vectorized lookup.
+        
+        Args:
+            symbols: Iterable of (exchange, symbol) tuples
+        """
+        wanted = {}
+        for exchange, symbol in symbols:
+            if (exchange, symbol) not in self._token_index:
+                wanted.setdefault(exchange, []).append(symbol)
+        
+        for exchange, names in wanted.items():
+            tokens = _instrument_tokens(self.trader, exchange, tuple(names))
+            self._token_index.update(
+                ((exchange, symbol), token) for symbol, token in tokens.items()
+            )
     
     def get_instrument_token(self, exchange, symbol):
         """
@@ -30,37 +88,115 @@ class MarketDataStream:
         Returns:
             int: Instrument token
         """
-        instruments = self.trader.get_instruments(exchange)
-        
-        for instrument in instruments:
-            if instrument['tradingsymbol'] == symbol:
-                return instrument['instrument_token']
-        
-        return None
+        self._build_token_index([(exchange, symbol)])
+        return self._token_index.get((exchange, symbol))
     
     def on_ticks(self, ws, ticks):
-        """Handle incoming tick data"""
+        """
+        Handle incoming tick data
+        
+        Runs on the WebSocket thread, so it only queues the ticks for the
+        render thread; when the queue is full the tick is dropped and
+        counted rather than stalling the socket.
+        """
+        put = self._tick_q.put_nowait
         for tick in ticks:
-            print(f"\n--- {tick.get('tradable', 'Unknown')} ---")
-            print(f"Instrument Token: {tick['instrument_token']}")
-            print(f"Last Price: ₹{tick['last_price']}")
-            print(f"Volume: {tick.get('volume', 0):,}")
-            print(f"Change: {tick.get('change', 0):.2f}%")
+            try:
+                put(tick)
+            except queue.Full:
+                self._dropped += 1
+    
+    def start_rendering(self):
+        """Start the thread that prints queued ticks"""
+        if self._render_thread is None:
+            self._render_thread = threading.Thread(
+                target=self._render_loop, name='tick-render', daemon=True
+            )
+            self._render_thread.start()
+    
+    def stop_rendering(self, timeout=2.0):
+        """Stop the render thread after it prints what is already queued"""
+        if self._render_thread is not None:
+            self._tick_q.put(_STOP)
+            self._render_thread.join(timeout)
+            self._render_thread = None
+        if self._dropped:
+            print(f"\n⚠ Dropped {self._dropped} ticks while rendering fell behind")
+    
+    def _render_loop(self):
+        """Drain the tick queue and render everything available in one write"""
+        get, get_nowait = self._tick_q.get, self._tick_q.get_nowait
+        while True:
+            # Late frames can be queued after _STOP; cut the batch there
+            batch = []
+            item = get()
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+                try:
+                    while len(batch) < TICK_QUEUE_SIZE:
+                        item = get_nowait()
+                        if item is _STOP:
+                            stop = True
+                            break
+                        batch.append(item)
+                except queue.Empty:
+                    pass
+            
+            if batch:
+                self._render_ticks(batch)
+            if stop:
+                return
+    
+    def _update_stats(self, ticks):
+        """
+        Fold a batch of ticks into the rolling stats with the compiled kernel
+        
+        Returns:
+            numpy.ndarray: Stats row of each tick's instrument as of that tick
+                (see update_tick_stats), so every line shows its running values
+        """
+        slot_of = self._slots.get
+        slots = np.fromiter((slot_of(t['instrument_token'], -1) for t in ticks),
+                            dtype=np.int64, count=len(ticks))
+        prices = np.fromiter((t['last_price'] for t in ticks),
+                             dtype=np.float64, count=len(ticks))
+        history = np.zeros((len(ticks), self._stats.shape[1]))
+        update_tick_stats(slots, prices, self._stats, STATS_ALPHA, history)
+        return history
+    
+    def _render_ticks(self, ticks):
+        """Format a batch of ticks"""
+        history = self._update_stats(ticks)
+        slot_of = self._slots.get
+        
+        # Build the whole batch and write it once instead of a print per line
+        lines = []
+        append = lines.append
+        
+        for tick, row in zip(ticks, history):
+            append(_TICK_HEADER(tick.get('tradable', 'Unknown'), tick['instrument_token'],
+                                tick['last_price'], tick.get('volume_traded', 0),
+                                tick.get('change', 0)))
             
-            if 'ohlc' in tick:
-                print(f"OHLC: O={tick['ohlc']['open']}, "
-                      f"H={tick['ohlc']['high']}, "
-                      f"L={tick['ohlc']['low']}, "
-                      f"C={tick['ohlc']['close']}")
+            if slot_of(tick['instrument_token']) is not None:
+                append(_TICK_STATS(row[STAT_TICKS], np.sqrt(row[STAT_VAR]) * 100))
             
-            if 'depth' in tick:
-                print("Market Depth:")
-                print("  Buy Side:")
-                for i, bid in enumerate(tick['depth']['buy'][:3], 1):
-                    print(f"    {i}. Price: ₹{bid['price']}, Qty: {bid['quantity']}, Orders: {bid['orders']}")
-                print("  Sell Side:")
-                for i, ask in enumerate(tick['depth']['sell'][:3], 1):
-                    print(f"    {i}. Price: ₹{ask['price']}, Qty: {ask['quantity']}, Orders: {ask['orders']}")
+            ohlc = tick.get('ohlc')
+            if ohlc is not None:
+                append(_TICK_OHLC(ohlc['open'], ohlc['high'], ohlc['low'], ohlc['close']))
+            
+            depth = tick.get('depth')
+            if depth is not None:
+                append("Market Depth:")
+                for side, levels in (("  Buy Side:", depth['buy']), ("  Sell Side:", depth['sell'])):
+                    append(side)
+                    for i in range(min(3, len(levels))):
+                        append(_DEPTH_LEVEL(i + 1, *_depth_fields(levels[i])))
+        
+        if lines:
+            lines.append('')
+            sys.stdout.write('\n'.join(lines))
     
     def on_connect(self, ws, response):
         """Handle connection event"""
@@ -74,55 +210,131 @@ class MarketDataStream:
     
     def on_close(self, ws, code, reason):
         """Handle close event"""
+        # No ws.stop(): the reactor is shared by later streams (see close())
         print(f"\n✗ Connection closed: {code} - {reason}")
-        ws.stop()
     
     def on_error(self, ws, code, reason):
         """Handle error event"""
         print(f"\n✗ Error: {code} - {reason}")
     
-    def start_streaming(self, symbols):
+    def subscribe(self, symbols):
         """
-        Start streaming market data for given symbols
+        Resolve symbols to tokens and subscribe to the ones not streamed yet
         
         Args:
             symbols: List of tuples [(exchange, symbol), ...]
+            
+        Returns:
+            list: Newly subscribed instrument tokens
         """
         print("\n=== Fetching Instrument Tokens ===")
         
+        self._build_token_index(symbols)
+        
+        new_tokens = []
         for exchange, symbol in symbols:
             token = self.get_instrument_token(exchange, symbol)
             if token:
-                self.instrument_tokens.append(token)
+                if token not in self.instrument_tokens and token not in new_tokens:
+                    new_tokens.append(token)
                 print(f"✓ {exchange}:{symbol} -> Token: {token}")
             else:
                 print(f"✗ {exchange}:{symbol} -> Token not found")
         
-        if not self.instrument_tokens:
-            print("\n✗ No valid instruments to stream")
+        # Stats rows survive unsubscribe, so only unseen tokens get a new row
+        unseen = [token for token in new_tokens if token not in self._slots]
+        if unseen:
+            base = len(self._slots)
+            self._slots.update((token, base + i) for i, token in enumerate(unseen))
+            self._stats = np.vstack((self._stats, np.zeros((len(unseen), 4))))
+        
+        self.instrument_tokens.extend(new_tokens)
+        if new_tokens and self._kws is not None:
+            self._kws.subscribe_with_mode(new_tokens)
+        return new_tokens
+    
+    def unsubscribe_all(self):
+        """Stop streaming every instrument but keep the connection open"""
+        if self._kws is not None and self.instrument_tokens:
+            self._kws.unsubscribe(self.instrument_tokens)
+        self.instrument_tokens = []
+    
+    def connect_async(self):
+        """Open the WebSocket on a background thread, once per instance"""
+        if self._kws is not None:
             return
         
         print(f"\n=== Starting WebSocket Stream ===")
-        print("Press Ctrl+C to stop\n")
-        
-        # Create WebSocket instance
-        kws = KiteWebSocket(
+        self._kws = KiteWebSocket(
             on_ticks_callback=self.on_ticks,
             on_connect_callback=self.on_connect,
             on_close_callback=self.on_close,
             on_error_callback=self.on_error
         )
+        self.start_rendering()
+        self._kws.connect(threaded=True)
+    
+    def close(self):
+        """Close the connection and stop rendering"""
+        if self._kws is not None:
+            self._kws.close()
+            self._kws = None
+        self.stop_rendering()
+    
+    def stream(self, symbols):
+        """
+        Stream symbols until Ctrl+C, then unsubscribe them
+        
+        The connection, instrument lookups and stats stay alive, so a later
+        call (e.g. the next launcher pick) only sends a subscription.
+        
+        Args:
+            symbols: List of tuples [(exchange, symbol), ...]
+        """
+        self.subscribe(symbols)
+        
+        if not self.instrument_tokens:
+            print("\n✗ No valid instruments to stream")
+            return
+        
+        self.connect_async()
+        print("Press Ctrl+C to stop\n")
         
         try:
-            kws.connect()
+            while True:
+                time.sleep(1)
         except KeyboardInterrupt:
             print("\n\nStopping stream...")
-            kws.close()
-            print("Stream stopped")
+            self.unsubscribe_all()
+            print("Stream stopped (connection kept open)")
+    
+    def start_streaming(self, symbols):
+        """
+        Stream symbols until Ctrl+C, then close the connection
+        
+        Args:
+            symbols: List of tuples [(exchange, symbol), ...]
+        """
+        try:
+            self.stream(symbols)
+        finally:
+            self.close()
+
+
+# Shared by main() calls within one process, e.g. repeated launcher picks
+_streamer = None
+
+
+def get_streamer():
+    """Get the process-wide MarketDataStream, creating it on first use"""
+    global _streamer
+    if _streamer is None:
+        _streamer = MarketDataStream()
+    return _streamer
 
 
 def main():
-    streamer = MarketDataStream()
+    streamer = get_streamer()
     
     # Define symbols to stream
     # Format: [(exchange, symbol), ...]
@@ -134,9 +346,15 @@ def main():
         ('NSE', 'SBIN')
     ]
     
-    # Start streaming
-    streamer.start_streaming(symbols)
+    # Start streaming; the connection is reused by the next call
+    streamer.stream(symbols)
 
 
 if __name__ == "__main__":
-    main()
+    # Only when run directly; the launcher imports this module in-process
+    logging.basicConfig(level=logging.INFO)
+    try:
+        main()
+    finally:
+        if _streamer is not None:
+            _streamer.close()
@@ -2,28 +2,40 @@
 """
 Debug script to print all position fields
 """
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+import numpy as np
 
 from Core_Modules.trader import KiteTrader
-import json
+
+try:
+    import orjson
+    
+    def dumps(obj):
+        """Pretty-print obj as JSON (orjson, with str() for unknown types)"""
+        return orjson.dumps(
+            obj, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+except ImportError:
+    import json
+    
+    def dumps(obj):
+        """Pretty-print obj as JSON (stdlib fallback)"""
+        return json.dumps(obj, indent=2, default=str)
+
+def nonzero_positions(rows):
+    """Positions with a non-zero quantity, selected with a NumPy mask"""
+    quantities = np.fromiter((p['quantity'] for p in rows), dtype=np.int64, count=len(rows))
+    return [rows[i] for i in np.flatnonzero(quantities)]
 
 def main():
     trader = KiteTrader()
     positions = trader.get_positions()
     
-    print("\n=== NET POSITIONS ===")
-    for pos in positions.get('net', []):
-        if pos['quantity'] != 0:
-            print(f"\n{pos['tradingsymbol']}:")
-            print(json.dumps(pos, indent=2, default=str))
-    
-    print("\n=== DAY POSITIONS ===")
-    for pos in positions.get('day', []):
-        if pos['quantity'] != 0:
+    for key in ('net', 'day'):
+        print(f"\n=== {key.upper()} POSITIONS ===")
+        for pos in nonzero_positions(positions.get(key, [])):
             print(f"\n{pos['tradingsymbol']}:")
-            print(json.dumps(pos, indent=2, default=str))
+            print(dumps(pos))
 
 if __name__ == "__main__":
     main()
@@ -3,54 +3,94 @@
 Launcher script for Zerodha Kite Trading Bot
 Provides easy access to main applications
 """
+import argparse
+import importlib
+import signal
 import sys
-import os
 
+# Menu choice -> (subcommand, menu label, banner, module, entry point function)
+APPS = {
+    '1': ('verify', "Verify Setup", "Running Setup Verification",
+          'Application.verify_setup', 'check_environment'),
+    '2': ('auth', "Authenticate (First time / Daily login)", "Starting Authentication",
+          'Application.authenticate', 'main'),
+    '3': ('app', "Start Trading Application (Enhanced CLI)",
+          "Starting Enhanced Trading Application", 'Application.main_enhanced', 'main'),
+    '4': ('basic', "Run Basic Order Example", "Running Basic Order Example",
+          'Examples.basic_order', 'main'),
+    '5': ('limit', "Run Limit Order Example", "Running Limit Order Example",
+          'Examples.limit_order', 'main'),
+    '6': ('stream', "Run WebSocket Stream Example", "Running WebSocket Stream Example",
+          'Examples.websocket_stream', 'main'),
+}
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(__file__))
-
-# Python executable to use
-PYTHON_EXE = 'python3.9'
+# Modules imported by earlier menu picks, reused for the rest of the session
+_loaded = {}
 
 def show_menu():
     """Display launcher menu"""
     print("\n" + "="*60)
     print("  ZERODHA KITE TRADING BOT - TERMINAL LAUNCHER")
     print("="*60)
-    print("\n1. Verify Setup")
-    print("2. Authenticate (First time / Daily login)")
-    print("3. Start Trading Application (Enhanced CLI)")
-    print("4. Run Basic Order Example")
-    print("5. Run Limit Order Example")
-    print("6. Run WebSocket Stream Example")
+    print()
+    for choice, (_, label, _, _, _) in APPS.items():
+        print(f"{choice}. {label}")
     print("7. Exit")
     print("\n" + "="*60)
 
-def main():
-    """Main launcher function"""
+def run_app(choice):
+    """
+    Run a menu entry in this interpreter
+    
+    The target module is imported on first use and kept in _loaded, so
+    later picks skip interpreter startup and re-imports. SystemExit and
+    errors from the app are caught so the launcher keeps running, and
+    SIGINT/SIGTERM handlers installed by the app are restored afterwards.
+    
+    Args:
+        choice: Key into APPS
+        
+    Returns:
+        int: Exit status of the app (0 on success)
+    """
+    _, _, banner, module_name, entry_point = APPS[choice]
+    print(f"\n--- {banner} ---\n")
+    
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        module = _loaded.get(module_name)
+        if module is None:
+            module = _loaded[module_name] = importlib.import_module(module_name)
+        result = getattr(module, entry_point)()
+    except SystemExit as e:
+        result = e.code
+    except KeyboardInterrupt:
+        print("\n\nInterrupted.")
+        return 130
+    except Exception as e:
+        print(f"\n✗ {module_name} failed: {e}")
+        return 1
+    finally:
+        for sig, handler in handlers.items():
+            # None means the handler was not set from Python
+            if handler is not None:
+                signal.signal(sig, handler)
+    
+    # Entry points return None, a bool (verify) or an exit code (auth)
+    if result is None or result is True:
+        return 0
+    if result is False:
+        return 1
+    return result if isinstance(result, int) else 1
+
+def interactive():
+    """Interactive menu loop"""
     while True:
         show_menu()
         choice = input("\nEnter your choice (1-7): ").strip()
         
-        if choice == '1':
-            print("\n--- Running Setup Verification ---\n")
-            os.system(f'{PYTHON_EXE} Application/verify_setup.py')
-        elif choice == '2':
-            print("\n--- Starting Authentication ---\n")
-            os.system(f'{PYTHON_EXE} Application/authenticate.py')
-        elif choice == '3':
-            print("\n--- Starting Enhanced Trading Application ---\n")
-            os.system(f'{PYTHON_EXE} Application/main_enhanced.py')
-        elif choice == '4':
-            print("\n--- Running Basic Order Example ---\n")
-            os.system(f'{PYTHON_EXE} Examples/basic_order.py')
-        elif choice == '5':
-            print("\n--- Running Limit Order Example ---\n")
-            os.system(f'{PYTHON_EXE} Examples/limit_order.py')
-        elif choice == '6':
-            print("\n--- Running WebSocket Stream Example ---\n")
-            os.system(f'{PYTHON_EXE} Examples/websocket_stream.py')
+        if choice in APPS:
+            run_app(choice)
         elif choice == '7':
             print("\nGoodbye!")
             break
@@ -60,9 +100,37 @@ def main():
         if choice != '7':
             input("\nPress Enter to continue...")
 
+def build_parser():
+    """Command line parser with one subcommand per menu entry"""
+    parser = argparse.ArgumentParser(
+        description="Zerodha Kite Trading Bot launcher. "
+                    "Run without a command for the interactive menu."
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    for choice, (command, label, _, _, _) in APPS.items():
+        subparser = subparsers.add_parser(command, help=label)
+        subparser.set_defaults(choice=choice)
+    return parser
+
+def main(argv=None):
+    """
+    Main launcher function
+    
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+        
+    Returns:
+        int: Exit status
+    """
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    return run_app(args.choice)
+
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n\nExiting...")
         sys.exit(0)